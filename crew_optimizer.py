@@ -1,17 +1,191 @@
 """
 Module for optimizing crew scheduling
 """
+from array import array
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
+import heapq
 import random
 
+ATTENDANTS_PER_FLIGHT = 4
+UNAVAILABLE_COST = 1e9  # Cost marking a crew/flight pair as infeasible
+CREW_BASES = ('DEL', 'BOM', 'BLR')
+AUCTION_CREW_THRESHOLD = 64  # Crew pools larger than this use the auction solver
+
+
+def _hungarian_assignment(cost):
+    """Solve a rectangular min-cost assignment (Hungarian / Kuhn-Munkres)"""
+    if not cost or not cost[0]:
+        return []
+    
+    # The solver needs rows <= columns, so transpose tall matrices
+    transposed = len(cost) > len(cost[0])
+    if transposed:
+        cost = [list(col) for col in zip(*cost)]
+    
+    n, m = len(cost), len(cost[0])
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # match[j] = row (1-based) assigned to column j
+    way = [0] * (m + 1)
+    
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            ui0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui0 - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    
+    # Return (row, col) pairs, dropping matches that are infeasible
+    pairs = []
+    for j in range(1, m + 1):
+        i = match[j]
+        if i and cost[i - 1][j - 1] < UNAVAILABLE_COST:
+            pairs.append((j - 1, i - 1) if transposed else (i - 1, j - 1))
+    return pairs
+
+
+def _auction_assignment(cost, min_eps=1e-4):
+    """Approximate min-cost assignment with Bertsekas' auction and eps-scaling"""
+    if not cost or not cost[0]:
+        return []
+    
+    # Rows bid for columns, so the bidders must be the smaller side
+    transposed = len(cost) > len(cost[0])
+    if transposed:
+        cost = [list(col) for col in zip(*cost)]
+    
+    n, m = len(cost), len(cost[0])
+    feasible = [c for row in cost for c in row if c < UNAVAILABLE_COST]
+    if not feasible:
+        return []
+    
+    # Infeasible pairs get a finite penalty so every bidder can always be placed;
+    # dummy zero-value bidders square the problem up so forward bidding stays optimal
+    spread = max(abs(c) for c in feasible)
+    penalty = -(n + 1) * (spread + 1)
+    values = [
+        [-c if c < UNAVAILABLE_COST else penalty for c in row]
+        for row in cost
+    ] + [[0.0] * m for _ in range(m - n)]
+    
+    eps = max(spread / 2, min_eps)
+    prices = [0.0] * m
+    
+    while True:
+        owner = [-1] * m
+        unassigned = deque(range(m))
+        while unassigned:
+            i = unassigned.popleft()
+            row = values[i]
+            # Best and second-best net value at current prices
+            best_j = 0
+            best = second = float('-inf')
+            for j in range(m):
+                net = row[j] - prices[j]
+                if net > best:
+                    best_j, second, best = j, best, net
+                elif net > second:
+                    second = net
+            if second == float('-inf'):
+                second = best
+            
+            prices[best_j] += best - second + eps
+            if owner[best_j] != -1:
+                unassigned.append(owner[best_j])
+            owner[best_j] = i
+        
+        if eps <= min_eps:
+            break
+        eps = max(eps / 4, min_eps)
+    
+    pairs = []
+    for j, i in enumerate(owner):
+        if i < n and cost[i][j] < UNAVAILABLE_COST:
+            pairs.append((j, i) if transposed else (i, j))
+    return pairs
+
+
+ASSIGNMENT_SOLVERS = {
+    'hungarian': _hungarian_assignment,
+    'auction': _auction_assignment
+}
+
+
+def _assignment_solver(name):
+    """Look up an assignment solver by name"""
+    try:
+        return ASSIGNMENT_SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown assignment solver: {name}") from None
+
+
 class CrewOptimizer:
-    def __init__(self):
+    def __init__(self, *, solver=None):
+        self._rng = random.Random()
         self.crew_members = self._initialize_crew()
         self.schedule = {}
         
+        # Exact Hungarian matching for small pools, auction for large ones
+        if solver is None:
+            solver = 'auction' if len(self.crew_members) > AUCTION_CREW_THRESHOLD else 'hungarian'
+        _assignment_solver(solver)  # Fail at construction rather than on the first schedule
+        self.solver = solver
+        
+        # Fields read by availability checks, stored as columns indexed by crew position
+        self.crew_roles = [c['role'] for c in self.crew_members]
+        self.crew_bases = [c['base'] for c in self.crew_members]
+        self.crew_next_available = [c['next_available'] for c in self.crew_members]
+        self.crew_rest_hours = array('h', (c['rest_hours'] for c in self.crew_members))
+        
+        # Crew indexed by role, each a min-heap of positions keyed on next availability
+        self.crew_heaps = defaultdict(list)
+        for index, crew_member in enumerate(self.crew_members):
+            self.crew_heaps[crew_member['role']].append(
+                (crew_member['next_available'], crew_member['crew_id'], index)
+            )
+        for heap in self.crew_heaps.values():
+            heapq.heapify(heap)
+    
     def _initialize_crew(self):
         """Initialize crew database"""
         crew = []
+        now = datetime.now()
+        
+        # Draw all random crew attributes up front
+        pilot_hours = self._rng.choices(range(500, 5001), k=10)
+        pilot_bases = self._rng.choices(CREW_BASES, k=10)
+        attendant_bases = self._rng.choices(CREW_BASES, k=20)
         
         # Pilots
         for i in range(1, 11):
@@ -20,10 +194,10 @@ class CrewOptimizer:
                 'name': f"Captain Pilot {i}",
                 'role': 'pilot',
                 'license_type': 'ATPL',
-                'flight_hours': random.randint(500, 5000),
-                'base': random.choice(['DEL', 'BOM', 'BLR']),
+                'flight_hours': pilot_hours[i - 1],
+                'base': pilot_bases[i - 1],
                 'rest_hours': 0,
-                'next_available': datetime.now(),
+                'next_available': now,
                 'assigned_flights': []
             })
         
@@ -34,21 +208,20 @@ class CrewOptimizer:
                 'name': f"Flight Attendant {i}",
                 'role': 'attendant',
                 'type_ratings': ['A320', 'B737'] if i % 2 == 0 else ['B787', 'A350'],
-                'base': random.choice(['DEL', 'BOM', 'BLR']),
+                'base': attendant_bases[i - 1],
                 'rest_hours': 0,
-                'next_available': datetime.now(),
+                'next_available': now,
                 'assigned_flights': []
             })
         
         return crew
     
-    def optimize_schedule(self, flights_data):
+    def optimize_schedule(self, flights_data, *, solver=None):
         """Optimize crew scheduling for all flights"""
-        assignments = []
+        solve = _assignment_solver(solver or self.solver)
         
-        for flight in flights_data:
-            assignment = self._assign_crew_to_flight(flight)
-            assignments.append(assignment)
+        now = datetime.now()
+        assignments = self._match_crew_to_flights(flights_data, now, solve)
         
         # Check for issues
         issues = self._check_schedule_issues(assignments)
@@ -59,86 +232,156 @@ class CrewOptimizer:
             'summary': self._generate_summary(assignments)
         }
     
-    def _assign_crew_to_flight(self, flight):
-        """Assign crew to a specific flight"""
+    def _match_crew_to_flights(self, flights_data, now, solve):
+        """Assign crew to all flights by solving min-cost bipartite matchings"""
+        pilots = self._pop_available('pilot', now)
+        attendants = self._pop_available('attendant', now)
+        origins = [self._get_flight_origin(flight) for flight in flights_data]
+        
+        # Senior half of the available pilots fly as captains, the rest as first officers
+        available_pilots = [i for i in pilots if self._is_available(i, now)]
+        available_pilots.sort(key=lambda i: self.crew_members[i]['flight_hours'], reverse=True)
+        captain_pool = available_pilots[:(len(available_pilots) + 1) // 2]
+        fo_pool = available_pilots[len(captain_pool):]
+        
+        captain_cost = self._cost_matrix(captain_pool, origins, range(len(origins)), now)
+        captains = {j: captain_pool[i] for i, j in solve(captain_cost)}
+        
+        # First officers only for flights that already have a captain
+        crewed = sorted(captains)
+        fo_cost = self._cost_matrix(fo_pool, [origins[j] for j in crewed], crewed, now)
+        first_officers = {crewed[k]: fo_pool[i] for i, k in solve(fo_cost)}
+        
+        # Attendants fill up to four seats on each crewed flight
+        slots = [j for j in crewed for _ in range(ATTENDANTS_PER_FLIGHT)]
+        att_cost = self._cost_matrix(attendants, [origins[j] for j in slots], slots, now)
+        flight_attendants = {}
+        for i, k in sorted(solve(att_cost), key=lambda pair: pair[1]):
+            flight_attendants.setdefault(slots[k], []).append(attendants[i])
+        
+        now_iso = now.isoformat()
+        durations = self._rng.choices(range(1, 7), k=len(flights_data))  # hours
+        assignments = []
+        for j, flight in enumerate(flights_data):
+            assignment = self._assign_crew_to_flight(
+                flight,
+                captains.get(j),
+                first_officers.get(j),
+                flight_attendants.get(j, []),
+                durations[j],
+                now,
+                now_iso
+            )
+            assignments.append(assignment)
+        
+        # Return crew to the heaps keyed on their updated availability
+        self._release(pilots + attendants)
+        
+        return assignments
+    
+    def _pop_available(self, role, now):
+        """Pop the position of every crew member of a role who is off rest by now"""
+        heap = self.crew_heaps[role]
+        available = []
+        while heap and heap[0][0] <= now:
+            available.append(heapq.heappop(heap)[2])
+        return available
+    
+    def _release(self, indices):
+        """Push crew positions back onto their role heaps"""
+        for index in indices:
+            heapq.heappush(
+                self.crew_heaps[self.crew_roles[index]],
+                (self.crew_next_available[index], self.crew_members[index]['crew_id'], index)
+            )
+    
+    def _get_flight_origin(self, flight):
+        """Get the departure airport of a flight from its logs"""
+        for log in flight['logs']:
+            if log.get('origin'):
+                return log['origin']
+        return None
+    
+    def _is_available(self, index, now):
+        """Check whether the crew member at a position can be rostered right now"""
+        if self.crew_next_available[index] > now:
+            return False
+        if self.crew_roles[index] == 'pilot' and self.crew_rest_hours[index] > 8:  # Maximum duty time
+            return False
+        return True
+    
+    def _cost_matrix(self, pool, origins, flight_indices, now):
+        """Cost of assigning each crew position in the pool to each flight slot"""
+        matrix = []
+        for index in pool:
+            # Hard constraints: crew still resting or over duty time
+            if not self._is_available(index, now):
+                matrix.append([UNAVAILABLE_COST] * len(origins))
+                continue
+            
+            # Prefer crew based at the departure airport, then earlier flights
+            base = self.crew_bases[index]
+            matrix.append([
+                (0 if base == origin else 1) + j * 1e-6
+                for origin, j in zip(origins, flight_indices)
+            ])
+        return matrix
+    
+    def _book(self, index, flight_id, available_at):
+        """Book the crew member at a position onto a flight"""
+        crew_member = self.crew_members[index]
+        crew_member['next_available'] = available_at
+        crew_member['assigned_flights'].append(flight_id)
+        self.crew_next_available[index] = available_at
+        return crew_member['crew_id']
+    
+    def _assign_crew_to_flight(self, flight, captain, first_officer, attendants, flight_duration, now, now_iso):
+        """Record the selected crew positions for a specific flight"""
         flight_id = flight['flight_id']
         aircraft_id = flight['aircraft_id']
         
-        # Get available crew
-        available_pilots = [
-            c for c in self.crew_members 
-            if c['role'] == 'pilot' 
-            and c['next_available'] <= datetime.now()
-            and c['rest_hours'] <= 8  # Maximum duty time
-        ]
-        
-        available_attendants = [
-            c for c in self.crew_members 
-            if c['role'] == 'attendant'
-            and c['next_available'] <= datetime.now()
-        ]
-        
-        # Select crew
-        captain = random.choice(available_pilots[:5]) if available_pilots else None
-        first_officer = random.choice(available_pilots[5:]) if len(available_pilots) > 5 else None
-        attendants = random.sample(available_attendants, min(4, len(available_attendants)))
-        
         # Update crew availability
-        flight_duration = random.randint(1, 6)  # hours
         rest_period = timedelta(hours=flight_duration + 10)  # 10 hours rest minimum
+        available_at = now + rest_period
         
-        if captain:
-            captain['next_available'] = datetime.now() + rest_period
-            captain['assigned_flights'].append(flight_id)
-        
-        if first_officer:
-            first_officer['next_available'] = datetime.now() + rest_period
-            first_officer['assigned_flights'].append(flight_id)
-        
-        for attendant in attendants:
-            attendant['next_available'] = datetime.now() + rest_period
-            attendant['assigned_flights'].append(flight_id)
+        captain_id = self._book(captain, flight_id, available_at) if captain is not None else None
+        first_officer_id = self._book(first_officer, flight_id, available_at) if first_officer is not None else None
+        attendant_ids = [self._book(a, flight_id, available_at) for a in attendants]
         
         return {
             'flight_id': flight_id,
             'aircraft_id': aircraft_id,
-            'captain': captain['crew_id'] if captain else None,
-            'first_officer': first_officer['crew_id'] if first_officer else None,
-            'attendants': [a['crew_id'] for a in attendants],
-            'crew_count': len(attendants) + (1 if captain else 0) + (1 if first_officer else 0),
-            'assignment_time': datetime.now().isoformat()
+            'captain': captain_id,
+            'first_officer': first_officer_id,
+            'attendants': attendant_ids,
+            'crew_count': len(attendant_ids) + (1 if captain_id else 0) + (1 if first_officer_id else 0),
+            'assignment_time': now_iso
         }
     
     def _check_schedule_issues(self, assignments):
         """Check for scheduling issues"""
         issues = []
         
-        # Check for double booking
-        crew_assignments = {}
+        # Check for double booking: collect every flight per crew member in one pass
+        bookings = defaultdict(list)
+        pilot_ids = set()
         for assignment in assignments:
             flight_id = assignment['flight_id']
-            
-            for crew_role in ['captain', 'first_officer']:
-                crew_id = assignment.get(crew_role)
+            for crew_id in (assignment.get('captain'), assignment.get('first_officer')):
                 if crew_id:
-                    if crew_id in crew_assignments:
-                        issues.append({
-                            'type': 'DOUBLE_BOOKING',
-                            'crew_id': crew_id,
-                            'flights': [crew_assignments[crew_id], flight_id],
-                            'severity': 'HIGH'
-                        })
-                    crew_assignments[crew_id] = flight_id
-            
+                    bookings[crew_id].append(flight_id)
+                    pilot_ids.add(crew_id)
             for attendant_id in assignment.get('attendants', []):
-                if attendant_id in crew_assignments:
-                    issues.append({
-                        'type': 'DOUBLE_BOOKING',
-                        'crew_id': attendant_id,
-                        'flights': [crew_assignments[attendant_id], flight_id],
-                        'severity': 'MEDIUM'
-                    })
-                crew_assignments[attendant_id] = flight_id
+                bookings[attendant_id].append(flight_id)
+        
+        for crew_id, flights in bookings.items():
+            if len(flights) > 1:
+                issues.append({
+                    'type': 'DOUBLE_BOOKING',
+                    'crew_id': crew_id,
+                    'flights': flights,
+                    'severity': 'HIGH' if crew_id in pilot_ids else 'MEDIUM'
+                })
         
         # Check for crew shortages
         for assignment in assignments:
@@ -155,16 +398,13 @@ class CrewOptimizer:
     def _generate_summary(self, assignments):
         """Generate crew scheduling summary"""
         total_assignments = len(assignments)
-        crew_utilization = {}
+        crew_utilization = Counter()
         
         for assignment in assignments:
-            for crew_role in ['captain', 'first_officer']:
-                crew_id = assignment.get(crew_role)
-                if crew_id:
-                    crew_utilization[crew_id] = crew_utilization.get(crew_id, 0) + 1
-            
-            for attendant_id in assignment.get('attendants', []):
-                crew_utilization[attendant_id] = crew_utilization.get(attendant_id, 0) + 1
+            crew_utilization.update(
+                crew_id for crew_id in (assignment.get('captain'), assignment.get('first_officer')) if crew_id
+            )
+            crew_utilization.update(assignment.get('attendants', []))
         
         return {
             'total_flights_scheduled': total_assignments,
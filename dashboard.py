@@ -1,8 +1,16 @@
 """
 Module for displaying operations dashboard
 """
+import heapq
+from collections import Counter, defaultdict
 from datetime import datetime
-from tabulate import tabulate
+from operator import itemgetter
+
+try:
+    from .tables import grid_table
+except ImportError:  # Loaded as a top-level module rather than from the package
+    from tables import grid_table
+
 
 class Dashboard:
     def __init__(self):
@@ -47,19 +55,10 @@ class Dashboard:
         print("-"*40)
         
         total_flights = len(flights_data)
-        aircraft_types = {}
-        routes = {}
-        
-        for flight in flights_data:
-            aircraft_id = flight['aircraft_id']
-            aircraft_types[aircraft_id] = aircraft_types.get(aircraft_id, 0) + 1
-            
-            # Get route
-            for log in flight['logs']:
-                if 'origin' in log and 'destination' in log:
-                    route = f"{log['origin']}-{log['destination']}"
-                    routes[route] = routes.get(route, 0) + 1
-                    break
+        aircraft_types = Counter(flight['aircraft_id'] for flight in flights_data)
+        routes = Counter(
+            route for route in (self._get_route(flight) for flight in flights_data) if route
+        )
         
         print(f"Total Flights Monitored: {total_flights}")
         print(f"Unique Aircraft: {len(aircraft_types)}")
@@ -68,10 +67,17 @@ class Dashboard:
         # Display popular routes
         if routes:
             print("\nTop Routes:")
-            sorted_routes = sorted(routes.items(), key=lambda x: x[1], reverse=True)[:5]
-            for route, count in sorted_routes:
+            for route, count in routes.most_common(5):
                 print(f"  {route}: {count} flights")
     
+    def _get_route(self, flight):
+        """Get the ORIGIN-DEST route of a flight, or None if no log carries one"""
+        # Computed once per render; the shared flight dicts are never written to
+        route_log = next(
+            (log for log in flight['logs'] if 'origin' in log and 'destination' in log), None
+        )
+        return f"{route_log['origin']}-{route_log['destination']}" if route_log else None
+    
     def _display_delay_predictions(self, delay_predictions):
         """Display delay predictions"""
         print("\n⏰ DELAY PREDICTIONS")
@@ -82,21 +88,18 @@ class Dashboard:
             return
         
         # Categorize delays
-        minor_delays = [d for d in delay_predictions if d['severity'] == 'MINOR']
-        moderate_delays = [d for d in delay_predictions if d['severity'] == 'MODERATE']
-        significant_delays = [d for d in delay_predictions if d['severity'] == 'SIGNIFICANT']
-        severe_delays = [d for d in delay_predictions if d['severity'] == 'SEVERE']
+        severity_counts = Counter(d['severity'] for d in delay_predictions)
         
         print(f"Total Delays Predicted: {len(delay_predictions)}")
-        print(f"Minor (<30 min): {len(minor_delays)}")
-        print(f"Moderate (30-60 min): {len(moderate_delays)}")
-        print(f"Significant (60-120 min): {len(significant_delays)}")
-        print(f"Severe (>120 min): {len(severe_delays)}")
+        print(f"Minor (<30 min): {severity_counts['MINOR']}")
+        print(f"Moderate (30-60 min): {severity_counts['MODERATE']}")
+        print(f"Significant (60-120 min): {severity_counts['SIGNIFICANT']}")
+        print(f"Severe (>120 min): {severity_counts['SEVERE']}")
         
         # Display top delays
         if delay_predictions:
             print("\nTop Delays:")
-            sorted_delays = sorted(delay_predictions, key=lambda x: x['predicted_delay_minutes'], reverse=True)[:5]
+            sorted_delays = heapq.nlargest(5, delay_predictions, key=lambda x: x['predicted_delay_minutes'])
             
             table_data = []
             for delay in sorted_delays:
@@ -104,11 +107,12 @@ class Dashboard:
                     delay['flight_id'],
                     f"{delay['predicted_delay_minutes']} min",
                     delay['severity'],
-                    ', '.join(delay['reasons'][:2])  # Show first 2 reasons
+                    # Show first 2 reasons, formatted only for the rows displayed
+                    ', '.join(template.format(value) for template, value in delay['reasons'][:2])
                 ])
             
             headers = ["Flight", "Delay", "Severity", "Reasons"]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            print(grid_table(table_data, headers))
     
     def _display_health_alerts(self, health_alerts):
         """Display health alerts"""
@@ -119,26 +123,26 @@ class Dashboard:
             print("No health alerts")
             return
         
-        critical_alerts = [a for a in health_alerts if a['severity'] == 'CRITICAL']
-        high_alerts = [a for a in health_alerts if a['severity'] == 'HIGH']
-        medium_alerts = [a for a in health_alerts if a['severity'] == 'MEDIUM']
+        # Bucket alerts by severity in one pass
+        severity_buckets = defaultdict(list)
+        for alert in health_alerts:
+            severity_buckets[alert['severity']].append(alert)
+        critical_alerts = severity_buckets['CRITICAL']
         
         print(f"Total Alerts: {len(health_alerts)}")
         print(f"Critical: {len(critical_alerts)}")
-        print(f"High: {len(high_alerts)}")
-        print(f"Medium: {len(medium_alerts)}")
+        print(f"High: {len(severity_buckets['HIGH'])}")
+        print(f"Medium: {len(severity_buckets['MEDIUM'])}")
         
         # Display critical alerts
         if critical_alerts:
             print("\n🔴 CRITICAL ALERTS:")
-            for alert in critical_alerts[:3]:  # Show top 3
+            # Show the 3 earliest without sorting the whole bucket
+            for alert in heapq.nsmallest(3, critical_alerts, key=itemgetter('timestamp')):
                 print(f"  Flight {alert['flight_id']}: {alert['message']}")
         
         # Alert types
-        alert_types = {}
-        for alert in health_alerts:
-            alert_type = alert['alert_type']
-            alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
+        alert_types = Counter(alert['alert_type'] for alert in health_alerts)
         
         if alert_types:
             print("\nAlert Types:")
@@ -154,17 +158,18 @@ class Dashboard:
             print("No load predictions")
             return
         
-        # Calculate statistics
-        total_passengers = sum(p['predicted_passengers'] for p in load_predictions)
-        avg_load_factor = sum(p['predicted_load_factor'] for p in load_predictions) / len(load_predictions)
-        
-        # Count scenarios
-        overbooking = sum(1 for p in load_predictions 
-                         if any(s['type'] == 'OVERBOOKING_RISK' for s in p['scenarios']))
-        high_demand = sum(1 for p in load_predictions 
-                         if any(s['type'] == 'HIGH_DEMAND' for s in p['scenarios']))
-        low_utilization = sum(1 for p in load_predictions 
-                            if any(s['type'] == 'LOW_UTILIZATION' for s in p['scenarios']))
+        # Calculate statistics and count scenarios in one pass
+        total_passengers = 0
+        total_load_factor = 0
+        overbooking = high_demand = low_utilization = 0
+        for p in load_predictions:
+            total_passengers += p['predicted_passengers']
+            total_load_factor += p['predicted_load_factor']
+            types = p['scenario_types']
+            overbooking += 'OVERBOOKING_RISK' in types
+            high_demand += 'HIGH_DEMAND' in types
+            low_utilization += 'LOW_UTILIZATION' in types
+        avg_load_factor = total_load_factor / len(load_predictions)
         
         print(f"Total Predicted Passengers: {total_passengers:,}")
         print(f"Average Load Factor: {avg_load_factor:.1%}")
@@ -175,7 +180,7 @@ class Dashboard:
         # Display top loaded flights
         if load_predictions:
             print("\nTop Loaded Flights:")
-            sorted_loads = sorted(load_predictions, key=lambda x: x['predicted_load_factor'], reverse=True)[:5]
+            sorted_loads = heapq.nlargest(5, load_predictions, key=lambda x: x['predicted_load_factor'])
             
             table_data = []
             for load in sorted_loads:
@@ -187,7 +192,7 @@ class Dashboard:
                 ])
             
             headers = ["Flight", "Passengers", "Load Factor", "Demand Level"]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            print(grid_table(table_data, headers))
     
     def _display_crew_status(self, crew_data):
         """Display crew scheduling status"""
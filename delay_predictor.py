@@ -2,8 +2,20 @@
 Module for predicting flight delays
 """
 import json
+import random
 from datetime import datetime, timedelta
 
+# Reasons are recorded as (template, value) pairs and only formatted when displayed;
+# values are rounded to the template's precision so pairs that read the same compare equal
+REASON_CROSSWIND = "High crosswind ({:.1f} knots)"
+REASON_VISIBILITY = "Low visibility ({:.0f} meters)"
+REASON_THUNDERSTORM = "Thunderstorm detected"
+REASON_TURBULENCE = "{} turbulence"
+REASON_THRUST = "Engine thrust deviation ({:.1f}%)"
+REASON_VIBRATION = "High engine vibration ({:.2f})"
+REASON_PASSENGER_LOAD = "High passenger load ({:.1f}%)"
+REASON_CONGESTION = "Operational congestion"
+
 class DelayPredictor:
     def __init__(self):
         self.thresholds = {
@@ -13,93 +25,110 @@ class DelayPredictor:
             'runway_queue_limit': 25,  # minutes
             'turbulence_threshold': 'moderate'
         }
+        self._rng = random.Random()
     
     def predict_delays(self, flights_data):
         """Predict delays for all flights"""
         predictions = []
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
+        # Resolve per-log-type scorers once for the whole batch
+        scorers = {
+            'weather_data': self._weather_delay,
+            'engine_performance': self._maintenance_delay,
+            'passenger_load': self._boarding_delay
+        }
         
-        for flight in flights_data:
-            prediction = self._predict_single_flight_delay(flight)
+        # Draw every flight's operational delay in one call
+        op_delays = self._rng.choices(range(21), k=len(flights_data))
+        
+        for flight, op_delay in zip(flights_data, op_delays):
+            prediction = self._predict_single_flight_delay(flight, scorers, now, now_iso, op_delay)
             if prediction['predicted_delay_minutes'] > 0:
                 predictions.append(prediction)
         
         return predictions
     
-    def _predict_single_flight_delay(self, flight):
+    def _predict_single_flight_delay(self, flight, scorers, now, now_iso, op_delay):
         """Predict delay for a single flight"""
         flight_id = flight['flight_id']
-        logs = flight['logs']
         
         delay_minutes = 0
         reasons = []
         
         # Analyze logs for delay indicators
-        for log in logs:
-            # Weather issues
-            if log['log_type'] == 'weather_data':
-                metrics = log['metrics']
-                
-                if metrics.get('crosswind', 0) > self.thresholds['crosswind_limit']:
-                    delay = min(60, metrics['crosswind'] - self.thresholds['crosswind_limit'])
-                    delay_minutes += delay
-                    reasons.append(f"High crosswind ({metrics['crosswind']:.1f} knots)")
-                
-                if metrics.get('visibility', float('inf')) < self.thresholds['visibility_limit']:
-                    delay_minutes += 30
-                    reasons.append(f"Low visibility ({metrics['visibility']:.0f} meters)")
-                
-                if metrics.get('thunderstorm', False):
-                    delay_minutes += 45
-                    reasons.append("Thunderstorm detected")
-                
-                if metrics.get('turbulence', '') in ['severe', 'extreme']:
-                    delay_minutes += 20
-                    reasons.append(f"{metrics['turbulence'].title()} turbulence")
-            
-            # Maintenance issues
-            elif log['log_type'] == 'engine_performance':
-                metrics = log['metrics']
-                
-                if 'engine_thrust' in metrics:
-                    thrust = metrics['engine_thrust']
-                    if abs(thrust - 100) > self.thresholds['engine_thrust_deviation']:
-                        delay_minutes += 60
-                        reasons.append(f"Engine thrust deviation ({thrust:.1f}%)")
-                
-                if metrics.get('engine_vibration', 0) > 3.0:
-                    delay_minutes += 90
-                    reasons.append(f"High engine vibration ({metrics['engine_vibration']:.2f})")
-            
-            # Operational issues
-            elif log['log_type'] == 'passenger_load':
-                metrics = log['metrics']
-                
-                # Simulate boarding delays for high load
-                load_factor = metrics.get('load_factor', 0)
-                if load_factor > 0.9:
-                    delay_minutes += 15
-                    reasons.append(f"High passenger load ({load_factor:.1%})")
+        for log in flight['logs']:
+            scorer = scorers.get(log['log_type'])
+            if scorer:
+                delay_minutes += scorer(log['metrics'], reasons)
         
         # Add random operational delay
-        import random
-        operational_delay = random.randint(0, 20)
-        if operational_delay > 10:
-            delay_minutes += operational_delay
-            reasons.append("Operational congestion")
+        if op_delay > 10:
+            delay_minutes += op_delay
+            reasons.append((REASON_CONGESTION, None))
         
         # Calculate estimated departure time
-        estimated_departure = datetime.now() + timedelta(minutes=delay_minutes)
+        estimated_departure = now + timedelta(minutes=delay_minutes)
         
         return {
             'flight_id': flight_id,
             'aircraft_id': flight['aircraft_id'],
             'predicted_delay_minutes': delay_minutes,
-            'reasons': list(set(reasons)),  # Remove duplicates
+            'reasons': list(dict.fromkeys(reasons)),  # Remove duplicates, keep first-seen order
             'estimated_departure': estimated_departure.isoformat(),
-            'prediction_time': datetime.now().isoformat(),
+            'prediction_time': now_iso,
             'severity': self._get_delay_severity(delay_minutes)
         }
     
+    def _weather_delay(self, metrics, reasons):
+        """Delay contribution of a weather log"""
+        delay_minutes = 0
+        crosswind_limit = self.thresholds['crosswind_limit']
+        
+        if metrics.get('crosswind', 0) > crosswind_limit:
+            delay_minutes += min(60, metrics['crosswind'] - crosswind_limit)
+            reasons.append((REASON_CROSSWIND, round(metrics['crosswind'], 1)))
+        
+        if metrics.get('visibility', float('inf')) < self.thresholds['visibility_limit']:
+            delay_minutes += 30
+            reasons.append((REASON_VISIBILITY, round(metrics['visibility'])))
+        
+        if metrics.get('thunderstorm', False):
+            delay_minutes += 45
+            reasons.append((REASON_THUNDERSTORM, None))
+        
+        if metrics.get('turbulence', '') in ['severe', 'extreme']:
+            delay_minutes += 20
+            reasons.append((REASON_TURBULENCE, metrics['turbulence'].title()))
+        
+        return delay_minutes
+    
+    def _maintenance_delay(self, metrics, reasons):
+        """Delay contribution of an engine performance log"""
+        delay_minutes = 0
+        
+        if 'engine_thrust' in metrics:
+            thrust = metrics['engine_thrust']
+            if abs(thrust - 100) > self.thresholds['engine_thrust_deviation']:
+                delay_minutes += 60
+                reasons.append((REASON_THRUST, round(thrust, 1)))
+        
+        if metrics.get('engine_vibration', 0) > 3.0:
+            delay_minutes += 90
+            reasons.append((REASON_VIBRATION, round(metrics['engine_vibration'], 2)))
+        
+        return delay_minutes
+    
+    def _boarding_delay(self, metrics, reasons):
+        """Delay contribution of a passenger load log"""
+        # Simulate boarding delays for high load
+        load_factor = metrics.get('load_factor', 0)
+        if load_factor > 0.9:
+            reasons.append((REASON_PASSENGER_LOAD, round(load_factor * 100, 1)))  # As a percentage
+            return 15
+        return 0
+    
     def _get_delay_severity(self, delay_minutes):
         """Categorize delay severity"""
         if delay_minutes == 0:
@@ -1,13 +1,75 @@
 """
 Module for monitoring aircraft health
 """
-import json
+import atexit
+import itertools
 import logging
+import logging.handlers
+import queue
+from collections import namedtuple
 from datetime import datetime
 
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:  # Fall back to the stdlib encoder
+    from json import dumps as _dumps
+
+# threshold is either a number or a key into HealthMonitor.thresholds;
+# severity escalates to HIGH when the value exceeds high_above
+AlertRule = namedtuple('AlertRule', [
+    'metric', 'threshold', 'alert_type', 'prefix', 'severity', 'high_above', 'message', 'critical'
+])
+
+ENGINE_RULES = (
+    AlertRule('engine_vibration', 'engine_vibration', 'ENGINE_VIBRATION_HIGH', 'ENG-VIB', 'MEDIUM', 5.0,
+              'Engine vibration {value:.2f} mm/s exceeds threshold {threshold} mm/s', False),
+    AlertRule('fuel_flow', 4500, 'HIGH_FUEL_BURN', 'FUEL-HIGH', 'MEDIUM', None,  # Abnormal high fuel burn
+              'High fuel burn detected: {value:.0f} kg/hr', False),
+    AlertRule('oil_temperature', 110, 'HIGH_OIL_TEMPERATURE', 'OIL-TEMP', 'HIGH', None,  # Degrees Celsius
+              'High oil temperature: {value:.1f}°C', True),
+)
+
+CABIN_RULES = (
+    AlertRule('pressure_drop_rate', 'cabin_pressure_drop', 'RAPID_CABIN_DEPRESSURIZATION', 'CAB-PRES', 'CRITICAL', None,
+              'Rapid cabin depressurization: {value:.3f} PSI/min', True),
+    AlertRule('cabin_temperature', 'cabin_temperature', 'HIGH_CABIN_TEMPERATURE', 'CAB-TEMP', 'MEDIUM', None,
+              'High cabin temperature: {value:.1f}°C', False),
+)
+
+class _JsonMessage:
+    """Log message that is only serialized when a handler formats it"""
+    __slots__ = ('payload',)
+    
+    def __init__(self, payload):
+        self.payload = payload
+    
+    def __str__(self):
+        return _dumps(self.payload)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+    
+    def prepare(self, record):
+        return record
+
+# Logger name -> its queue listener; loggers are process-wide, so each is wired up only once
+_LOG_LISTENERS = {}
+
+def _stop_log_listeners():
+    """Flush and stop every alert log listener"""
+    for listener in _LOG_LISTENERS.values():
+        listener.stop()
+    _LOG_LISTENERS.clear()
+
+atexit.register(_stop_log_listeners)
+
 class HealthMonitor:
     def __init__(self):
         # Setup logging
+        self.log_listeners = []
         self.health_logger = self._setup_logger('health_alerts', 'logs/aircraft_health_alerts.log')
         self.critical_logger = self._setup_logger('critical_alerts', 'logs/critical_flight_alerts.log')
         
@@ -18,21 +80,36 @@ class HealthMonitor:
             'cabin_temperature': 30,  # degrees Celsius
             'cabin_pressure_drop': 0.1,  # PSI per minute
         }
+        
+        self.alert_sequence = itertools.count(1)
+        self.engine_rules = self._resolve_rules(ENGINE_RULES)
+        self.cabin_rules = self._resolve_rules(CABIN_RULES)
     
     def _setup_logger(self, name, log_file):
-        """Setup logger for alerts"""
+        """Setup logger for alerts, reusing the handler and listener of an earlier monitor"""
         logger = logging.getLogger(name)
+        listener = _LOG_LISTENERS.get(name)
+        if listener is not None:
+            self.log_listeners.append(listener)
+            return logger
+        
         logger.setLevel(logging.INFO)
         
         # File handler
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
         
         # Formatter
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(formatter)
         
-        logger.addHandler(file_handler)
+        # Callers only enqueue; a background listener formats and writes to disk
+        log_queue = queue.Queue(-1)
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _LOG_LISTENERS[name] = listener
+        self.log_listeners.append(listener)
         
         return logger
     
@@ -40,13 +117,18 @@ class HealthMonitor:
         """Monitor health for all flights"""
         alerts = []
         
+        # One clock reading per batch; alert IDs are disambiguated by a counter
+        now = datetime.now()
+        timestamp = now.isoformat()
+        time_tag = now.strftime('%H%M%S')
+        
         for flight in flights_data:
-            flight_alerts = self._monitor_single_flight(flight)
+            flight_alerts = self._monitor_single_flight(flight, timestamp, time_tag)
             alerts.extend(flight_alerts)
         
         return alerts
     
-    def _monitor_single_flight(self, flight):
+    def _monitor_single_flight(self, flight, timestamp, time_tag):
         """Monitor health for a single flight"""
         flight_id = flight['flight_id']
         aircraft_id = flight['aircraft_id']
@@ -55,122 +137,66 @@ class HealthMonitor:
         # Check all logs for health issues
         for log in flight['logs']:
             if log['log_type'] == 'engine_performance':
-                engine_alerts = self._check_engine_health(log, flight_id, aircraft_id)
+                engine_alerts = self._check_engine_health(log, flight_id, aircraft_id, timestamp, time_tag)
                 alerts.extend(engine_alerts)
             
             elif log['log_type'] == 'cabin_pressure':
-                cabin_alerts = self._check_cabin_health(log, flight_id, aircraft_id)
+                cabin_alerts = self._check_cabin_health(log, flight_id, aircraft_id, timestamp, time_tag)
                 alerts.extend(cabin_alerts)
         
         return alerts
     
-    def _check_engine_health(self, log, flight_id, aircraft_id):
+    def _check_engine_health(self, log, flight_id, aircraft_id, timestamp, time_tag):
         """Check engine health metrics"""
-        alerts = []
-        metrics = log['metrics']
-        
-        # Engine vibration
-        vibration = metrics.get('engine_vibration', 0)
-        if vibration > self.thresholds['engine_vibration']:
-            alert = {
-                'alert_id': f"ENG-VIB-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'aircraft_id': aircraft_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'ENGINE_VIBRATION_HIGH',
-                'metric': 'engine_vibration',
-                'value': vibration,
-                'threshold': self.thresholds['engine_vibration'],
-                'severity': 'HIGH' if vibration > 5.0 else 'MEDIUM',
-                'message': f'Engine vibration {vibration:.2f} mm/s exceeds threshold {self.thresholds["engine_vibration"]} mm/s'
-            }
-            alerts.append(alert)
-            self._log_alert(alert)
-        
-        # Fuel burn
-        fuel_flow = metrics.get('fuel_flow', 0)
-        if fuel_flow > 4500:  # Abnormal high fuel burn
-            alert = {
-                'alert_id': f"FUEL-HIGH-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'aircraft_id': aircraft_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'HIGH_FUEL_BURN',
-                'metric': 'fuel_flow',
-                'value': fuel_flow,
-                'threshold': 4500,
-                'severity': 'MEDIUM',
-                'message': f'High fuel burn detected: {fuel_flow:.0f} kg/hr'
-            }
-            alerts.append(alert)
-            self._log_alert(alert)
-        
-        # Oil temperature
-        oil_temp = metrics.get('oil_temperature', 0)
-        if oil_temp > 110:  # Degrees Celsius
-            alert = {
-                'alert_id': f"OIL-TEMP-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'aircraft_id': aircraft_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'HIGH_OIL_TEMPERATURE',
-                'metric': 'oil_temperature',
-                'value': oil_temp,
-                'threshold': 110,
-                'severity': 'HIGH',
-                'message': f'High oil temperature: {oil_temp:.1f}°C'
-            }
-            alerts.append(alert)
-            self._log_alert(alert, critical=True)
-        
-        return alerts
+        return self._apply_rules(self.engine_rules, log['metrics'], flight_id, aircraft_id, timestamp, time_tag)
     
-    def _check_cabin_health(self, log, flight_id, aircraft_id):
+    def _check_cabin_health(self, log, flight_id, aircraft_id, timestamp, time_tag):
         """Check cabin health metrics"""
+        return self._apply_rules(self.cabin_rules, log['metrics'], flight_id, aircraft_id, timestamp, time_tag)
+    
+    def _resolve_rules(self, rules):
+        """Replace threshold names in a rule table with configured values"""
+        return tuple(
+            rule._replace(threshold=self.thresholds[rule.threshold])
+            if isinstance(rule.threshold, str) else rule
+            for rule in rules
+        )
+    
+    def _apply_rules(self, rules, metrics, flight_id, aircraft_id, timestamp, time_tag):
+        """Evaluate a rule table against one log's metrics"""
         alerts = []
-        metrics = log['metrics']
+        get_metric = metrics.get
+        alert_sequence = self.alert_sequence
         
-        # Cabin pressure
-        pressure_drop = metrics.get('pressure_drop_rate', 0)
-        if pressure_drop > self.thresholds['cabin_pressure_drop']:
-            alert = {
-                'alert_id': f"CAB-PRES-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'aircraft_id': aircraft_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'RAPID_CABIN_DEPRESSURIZATION',
-                'metric': 'pressure_drop_rate',
-                'value': pressure_drop,
-                'threshold': self.thresholds['cabin_pressure_drop'],
-                'severity': 'CRITICAL',
-                'message': f'Rapid cabin depressurization: {pressure_drop:.3f} PSI/min'
-            }
-            alerts.append(alert)
-            self._log_alert(alert, critical=True)
-        
-        # Cabin temperature
-        cabin_temp = metrics.get('cabin_temperature', 0)
-        if cabin_temp > self.thresholds['cabin_temperature']:
+        for metric, threshold, alert_type, prefix, severity, high_above, message, critical in rules:
+            value = get_metric(metric, 0)
+            if value <= threshold:
+                continue
+            
+            if high_above is not None and value > high_above:
+                severity = 'HIGH'
+            
             alert = {
-                'alert_id': f"CAB-TEMP-{datetime.now().strftime('%H%M%S')}",
+                'alert_id': f"{prefix}-{time_tag}-{next(alert_sequence)}",
                 'flight_id': flight_id,
                 'aircraft_id': aircraft_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'HIGH_CABIN_TEMPERATURE',
-                'metric': 'cabin_temperature',
-                'value': cabin_temp,
-                'threshold': self.thresholds['cabin_temperature'],
-                'severity': 'MEDIUM',
-                'message': f'High cabin temperature: {cabin_temp:.1f}°C'
+                'timestamp': timestamp,
+                'alert_type': alert_type,
+                'metric': metric,
+                'value': value,
+                'threshold': threshold,
+                'severity': severity,
+                'message': message.format(value=value, threshold=threshold)
             }
             alerts.append(alert)
-            self._log_alert(alert)
+            self._log_alert(alert, critical=critical)
         
         return alerts
     
     def _log_alert(self, alert, critical=False):
         """Log alert to appropriate log file"""
-        log_message = json.dumps(alert)
+        # Serialized later on the listener thread, so log a snapshot of the alert as emitted
+        log_message = _JsonMessage(dict(alert))
         
         if critical:
             self.critical_logger.critical(log_message)
@@ -1,87 +1,167 @@
 """
 Module for predicting passenger load and ticket demand
 """
-import statistics
-from datetime import datetime, timedelta
+import random
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from math import fsum, inf, nextafter
+
+DEFAULT_CAPACITY = 180
+
+HOLIDAYS = (
+    (1, 1),    # New Year
+    (12, 25),  # Christmas
+    (10, 2),   # Gandhi Jayanti
+    (8, 15),   # Independence Day
+)
+
+# Lookup tables for the integer codes produced by _load_kernel
+TREND_LABELS = ('decreasing', 'stable', 'increasing')
+DEMAND_LEVELS = ('VERY_LOW', 'LOW', 'MODERATE', 'HIGH', 'VERY_HIGH')
+DEMAND_THRESHOLDS = (0.3, 0.5, 0.7, 0.9)  # Load factor must exceed each to move up a level
+SCENARIO_TYPES = ('LOW_UTILIZATION', 'NORMAL_DEMAND', 'HIGH_DEMAND', 'OVERBOOKING_RISK')
+
+
+def _load_kernel(counts, load_factors, offsets, capacity, adjustment):
+    """Numeric core of load prediction over flattened passenger columns"""
+    # Outputs are preallocated per flight; flights without data keep the defaults
+    n = len(offsets) - 1
+    passengers = [0.0] * n
+    whole_passengers = [0] * n
+    available_seats = [capacity] * n
+    load = [0.0] * n
+    trend_codes = [1] * n
+    demand_codes = [0] * n
+    scenario_codes = [1] * n
+    
+    scale = 1 + adjustment
+    # Passenger bounds between scenarios: under 40% is low utilization, over 90%
+    # high demand and over 110% overbooking; nextafter makes exactly 40% count as normal
+    scenario_thresholds = (
+        nextafter(capacity * 0.4, -inf),
+        capacity * 0.9,
+        capacity * 1.1  # 10% overbooking
+    )
+    
+    # Percentage change across each flight's 5 most recent counts, for all flights at once
+    ends = offsets[1:]
+    recents = [max(start, end - 5) for start, end in zip(offsets, ends)]
+    trends = [
+        (counts[end - 1] - counts[recent]) / counts[recent]
+        if end - recent >= 2 and counts[recent] else 0
+        for recent, end in zip(recents, ends)
+    ]
+    
+    for i in range(n):
+        start = offsets[i]
+        end = offsets[i + 1]
+        size = end - start
+        if not size:
+            continue
+        
+        trend = trends[i]
+        pax = fsum(counts[start:end]) / size * (1 + trend) * scale
+        lf = fsum(load_factors[start:end]) / size * (1 + trend) * scale
+        passengers[i] = pax
+        
+        # Seats and the 100% load cap are clamped here rather than per output dict
+        whole = int(pax)
+        whole_passengers[i] = whole
+        available_seats[i] = capacity - whole if whole < capacity else 0
+        load[i] = lf if lf < 1.0 else 1.0
+        
+        trend_codes[i] = 2 if trend > 0.05 else 0 if trend < -0.05 else 1
+        
+        # Number of thresholds strictly below the value indexes the label tables
+        demand_codes[i] = bisect_left(DEMAND_THRESHOLDS, lf)
+        scenario_codes[i] = bisect_left(scenario_thresholds, pax)
+    
+    return {
+        'passengers': passengers,
+        'whole_passengers': whole_passengers,
+        'available_seats': available_seats,
+        'load_factor': load,
+        'trend_codes': trend_codes,
+        'demand_codes': demand_codes,
+        'scenario_codes': scenario_codes
+    }
+
+
+@lru_cache(maxsize=4)
+def _holiday_window(year):
+    """Ordinal days within a week before/after any of the year's holidays"""
+    window = set()
+    for month, day in HOLIDAYS:
+        center = date(year, month, day).toordinal()
+        window.update(range(center - 7, center + 8))
+    return frozenset(window)
+
 
 class LoadPredictor:
     def __init__(self):
         self.historical_data = {}
-        
+        self._rng = random.Random()
+    
     def predict_load(self, flights_data):
         """Predict passenger load for all flights"""
         predictions = []
+        now_iso = datetime.now().isoformat()
         
-        for flight in flights_data:
-            prediction = self._predict_single_flight_load(flight)
-            predictions.append(prediction)
-        
-        return predictions
-    
-    def _predict_single_flight_load(self, flight):
-        """Predict load for a single flight"""
-        flight_id = flight['flight_id']
-        
-        # Extract passenger data from logs
-        passenger_logs = [log for log in flight['logs'] if log['log_type'] == 'passenger_load']
-        
-        if not passenger_logs:
-            # Use default prediction
-            return self._default_prediction(flight_id)
-        
-        # Analyze historical patterns
-        passenger_counts = [log['metrics'].get('passenger_count', 0) for log in passenger_logs]
-        load_factors = [log['metrics'].get('load_factor', 0) for log in passenger_logs]
-        
-        # Calculate predictions
-        avg_passengers = statistics.mean(passenger_counts) if passenger_counts else 0
-        avg_load_factor = statistics.mean(load_factors) if load_factors else 0
-        
-        # Adjust for trends
-        trend = self._calculate_trend(passenger_logs)
-        
-        # Consider special factors
+        # External demand factors only depend on the date, so resolve them once per batch
         adjustment = self._get_demand_adjustment()
         
-        # Final prediction
-        predicted_passengers = avg_passengers * (1 + trend) * (1 + adjustment)
-        predicted_load_factor = avg_load_factor * (1 + trend) * (1 + adjustment)
-        
-        # Check for scenarios
-        capacity = 180  # Default capacity
-        scenarios = self._analyze_scenarios(predicted_passengers, capacity)
-        
-        return {
-            'flight_id': flight_id,
-            'aircraft_id': flight['aircraft_id'],
-            'predicted_passengers': int(predicted_passengers),
-            'predicted_load_factor': min(1.0, predicted_load_factor),  # Cap at 100%
-            'capacity': capacity,
-            'available_seats': max(0, capacity - int(predicted_passengers)),
-            'scenarios': scenarios,
-            'trend': 'increasing' if trend > 0.05 else 'decreasing' if trend < -0.05 else 'stable',
-            'demand_level': self._get_demand_level(predicted_load_factor),
-            'prediction_time': datetime.now().isoformat()
-        }
-    
-    def _calculate_trend(self, passenger_logs):
-        """Calculate passenger trend"""
-        if len(passenger_logs) < 2:
-            return 0
-        
-        # Simple trend calculation based on recent data
-        recent_counts = [log['metrics'].get('passenger_count', 0) for log in passenger_logs[-5:]]
-        if len(recent_counts) < 2:
-            return 0
-        
-        # Calculate percentage change
-        first = recent_counts[0]
-        last = recent_counts[-1]
-        
-        if first == 0:
-            return 0
+        # Flatten passenger logs into contiguous columns with per-flight offsets
+        counts = []
+        load_factors = []
+        offsets = [0]
+        for flight in flights_data:
+            for log in flight['logs']:
+                if log['log_type'] == 'passenger_load':
+                    metrics = log['metrics']
+                    counts.append(metrics.get('passenger_count', 0))
+                    load_factors.append(metrics.get('load_factor', 0))
+            offsets.append(len(counts))
+        
+        capacity = DEFAULT_CAPACITY
+        kernel = _load_kernel(counts, load_factors, offsets, capacity, adjustment)
+        passengers = kernel['passengers']
+        whole_passengers = kernel['whole_passengers']
+        available_seats = kernel['available_seats']
+        load = kernel['load_factor']
+        trend_codes = kernel['trend_codes']
+        demand_codes = kernel['demand_codes']
+        scenario_codes = kernel['scenario_codes']
+        
+        # Draw passenger counts for all flights without data in one call
+        missing = sum(1 for i in range(len(flights_data)) if offsets[i] == offsets[i + 1])
+        default_passengers = iter(self._rng.choices(range(80, 151), k=missing))
+        
+        for i, flight in enumerate(flights_data):
+            if offsets[i] == offsets[i + 1]:
+                # Use default prediction
+                predictions.append(
+                    self._default_prediction(flight['flight_id'], next(default_passengers), now_iso)
+                )
+                continue
+            
+            scenarios = self._analyze_scenarios(scenario_codes[i], passengers[i], capacity)
+            
+            predictions.append({
+                'flight_id': flight['flight_id'],
+                'aircraft_id': flight['aircraft_id'],
+                'predicted_passengers': whole_passengers[i],
+                'predicted_load_factor': load[i],  # Capped at 100% by the kernel
+                'capacity': capacity,
+                'available_seats': available_seats[i],
+                'scenarios': scenarios,
+                'scenario_types': frozenset(s['type'] for s in scenarios),  # For O(1) membership checks
+                'trend': TREND_LABELS[trend_codes[i]],
+                'demand_level': DEMAND_LEVELS[demand_codes[i]],
+                'prediction_time': now_iso
+            })
         
-        return (last - first) / first
+        return predictions
     
     def _get_demand_adjustment(self):
         """Adjust prediction based on external factors"""
@@ -89,17 +169,8 @@ class LoadPredictor:
         
         # Check for holidays
         today = datetime.now()
-        holidays = [
-            datetime(today.year, 1, 1),   # New Year
-            datetime(today.year, 12, 25), # Christmas
-            datetime(today.year, 10, 2),  # Gandhi Jayanti
-            datetime(today.year, 8, 15),  # Independence Day
-        ]
-        
-        for holiday in holidays:
-            days_diff = abs((today - holiday).days)
-            if days_diff <= 7:  # Week before/after holiday
-                adjustment += 0.15  # 15% increase
+        if today.toordinal() in _holiday_window(today.year):  # Week before/after holiday
+            adjustment += 0.15  # 15% increase
         
         # Weekend adjustment
         if today.weekday() >= 5:  # Saturday or Sunday
@@ -111,64 +182,44 @@ class LoadPredictor:
         
         return adjustment
     
-    def _analyze_scenarios(self, predicted_passengers, capacity):
-        """Analyze booking scenarios"""
-        scenarios = []
-        
-        # Overbooking scenario
-        overbooking_threshold = capacity * 1.1  # 10% overbooking
-        if predicted_passengers > overbooking_threshold:
-            scenarios.append({
-                'type': 'OVERBOOKING_RISK',
+    def _analyze_scenarios(self, scenario_code, predicted_passengers, capacity):
+        """Describe the booking scenario selected by the load kernel"""
+        scenario_type = SCENARIO_TYPES[scenario_code]
+        
+        if scenario_type == 'OVERBOOKING_RISK':
+            scenario = {
+                'type': scenario_type,
                 'severity': 'HIGH',
                 'message': f'Predicted passengers ({predicted_passengers:.0f}) exceed capacity by {(predicted_passengers/capacity - 1)*100:.1f}%'
-            })
-        
-        # High demand scenario
-        elif predicted_passengers > capacity * 0.9:
-            scenarios.append({
-                'type': 'HIGH_DEMAND',
+            }
+        elif scenario_type == 'HIGH_DEMAND':
+            scenario = {
+                'type': scenario_type,
                 'severity': 'MEDIUM',
                 'message': 'Flight expected to be nearly full'
-            })
-        
-        # Low utilization scenario
-        elif predicted_passengers < capacity * 0.4:
-            scenarios.append({
-                'type': 'LOW_UTILIZATION',
+            }
+        elif scenario_type == 'LOW_UTILIZATION':
+            scenario = {
+                'type': scenario_type,
                 'severity': 'LOW',
                 'message': 'Flight may be underutilized'
-            })
-        
-        # Normal scenario
+            }
         else:
-            scenarios.append({
-                'type': 'NORMAL_DEMAND',
+            scenario = {
+                'type': scenario_type,
                 'severity': 'LOW',
                 'message': 'Normal booking pattern expected'
-            })
+            }
         
-        return scenarios
+        return [scenario]
     
     def _get_demand_level(self, load_factor):
         """Categorize demand level"""
-        if load_factor > 0.9:
-            return "VERY_HIGH"
-        elif load_factor > 0.7:
-            return "HIGH"
-        elif load_factor > 0.5:
-            return "MODERATE"
-        elif load_factor > 0.3:
-            return "LOW"
-        else:
-            return "VERY_LOW"
+        return DEMAND_LEVELS[bisect_left(DEMAND_THRESHOLDS, load_factor)]
     
-    def _default_prediction(self, flight_id):
+    def _default_prediction(self, flight_id, predicted_passengers, now_iso):
         """Default prediction when no data is available"""
-        import random
-        
-        predicted_passengers = random.randint(80, 150)
-        capacity = 180
+        capacity = DEFAULT_CAPACITY
         
         return {
             'flight_id': flight_id,
@@ -177,7 +228,8 @@ class LoadPredictor:
             'capacity': capacity,
             'available_seats': capacity - predicted_passengers,
             'scenarios': [],
+            'scenario_types': frozenset(),
             'trend': 'stable',
             'demand_level': self._get_demand_level(predicted_passengers / capacity),
-            'prediction_time': datetime.now().isoformat()
+            'prediction_time': now_iso
         }
\ No newline at end of file
@@ -1,110 +1,236 @@
 """
 Module for processing airline operations logs
 """
-import json
+import logging
+import sys
 from datetime import datetime
-import statistics
+from math import fsum, inf
+from operator import attrgetter
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # Fall back to the stdlib parser
+    from json import loads as _loads
+
+try:
+    from .records import MappingRecord
+except ImportError:  # Loaded as a top-level module rather than from the package
+    from records import MappingRecord
+
+# Rejected entries are reported here; without configured handlers the warning still reaches stderr
+_log = logging.getLogger(__name__)
+
+# Fields the grouping loop reads from every processed log, fetched in one C call
+_GROUP_FIELDS = attrgetter('flight_id', 'status', 'log_type', 'metrics')
+
+class ProcessedLog(MappingRecord):
+    """Fixed-field processed log record that also reads like the old log dicts"""
+    __slots__ = (
+        'log_id', 'flight_id', 'aircraft_id', 'timestamp', 'log_type',
+        'metrics', 'status', 'origin', 'destination'
+    )
+    
+    def __init__(self, log_id, flight_id, aircraft_id, timestamp, log_type,
+                 metrics, status, origin, destination):
+        self.log_id = log_id
+        self.flight_id = flight_id
+        self.aircraft_id = aircraft_id
+        self.timestamp = timestamp
+        self.log_type = log_type
+        self.metrics = metrics
+        self.status = status
+        self.origin = origin
+        self.destination = destination
+    
+    def __repr__(self):
+        return f"ProcessedLog({', '.join(f'{k}={getattr(self, k)!r}' for k in self.__slots__)})"
+
+def _intern(value):
+    """Intern low-cardinality strings so repeated values share one object"""
+    return sys.intern(value) if type(value) is str else value
 
 class LogProcessor:
     def __init__(self):
         self.processed_logs = []
-        
+        self._groups = {}  # flight_id -> (flight, logs, metric columns) for the batch in progress
+        self._errors = []  # (log_id, error) pairs from the last batch
+        self._error_count = 0  # Entries rejected over this processor's lifetime
+    
+    @property
+    def error_count(self):
+        """Number of log entries rejected over this processor's lifetime"""
+        return self._error_count
+    
     def process_logs(self, log_entries):
         """Process raw log entries"""
-        processed_data = []
-        
-        for log in log_entries:
-            processed_log = self._process_single_log(log)
-            if processed_log:
-                processed_data.append(processed_log)
+        self._start_batch()
+        self.process_logs_chunk(log_entries)
+        return self._finish_batch()
+    
+    def process_log_file(self, path, chunk_size=10000):
+        """Process a JSON Lines log file in chunks instead of loading it whole"""
+        self._start_batch()
+        for chunk in self._read_log_chunks(path, chunk_size):
+            self.process_logs_chunk(chunk)
+        return self._finish_batch()
+    
+    def process_logs_chunk(self, log_entries):
+        """Process one chunk of raw log entries into the current batch"""
+        # Single pass: parse, group by flight and collect the metrics each summary needs
+        groups = self._groups
+        parsed = {}  # Timestamp string -> datetime for this chunk
         
-        # Group by flight
-        flights_by_id = {}
-        for log in processed_data:
-            flight_id = log['flight_id']
-            if flight_id not in flights_by_id:
-                flights_by_id[flight_id] = {
+        for log_entry in log_entries:
+            log = self._process_single_log(log_entry, parsed)
+            if log is None:
+                continue
+            
+            flight_id, status, log_type, metrics = _GROUP_FIELDS(log)
+            group = groups.get(flight_id)
+            if group is None:
+                flight = {
                     'flight_id': flight_id,
-                    'aircraft_id': log['aircraft_id'],
+                    'aircraft_id': log.aircraft_id,
                     'logs': [],
                     'metrics_summary': {}
                 }
-            flights_by_id[flight_id]['logs'].append(log)
+                group = groups[flight_id] = (flight, flight['logs'], self._new_accumulator())
+            _, flight_logs, acc = group
+            flight_logs.append(log)
+            
+            if status != 'NORMAL':
+                acc['alert_count'] += 1
+            
+            if log_type == 'engine_performance':
+                acc['thrust_values'].append(metrics.get('engine_thrust', 0))
+                vibration = metrics.get('engine_vibration', 0)
+                if vibration > acc['max_vibration']:
+                    acc['max_vibration'] = vibration
+            
+            elif log_type == 'weather_data':
+                acc['crosswind_values'].append(metrics.get('crosswind', 0))
+                visibility = metrics.get('visibility', 0)
+                if visibility < acc['min_visibility']:
+                    acc['min_visibility'] = visibility
+            
+            elif log_type == 'passenger_load':
+                acc['passenger_counts'].append(metrics.get('passenger_count', 0))
+    
+    def _start_batch(self):
+        """Reset per-batch grouping state and errors"""
+        self._groups = {}
+        self._errors = []
+    
+    def _finish_batch(self):
+        """Summarize every flight of the current batch and report rejected entries"""
+        # Report rejected entries once the batch is done, not from inside the hot loop
+        if self._errors:
+            self._error_count += len(self._errors)
+            if _log.isEnabledFor(logging.DEBUG):
+                for log_id, error in self._errors:
+                    _log.debug("Error processing log %s: %s", log_id, error)
+            _log.warning("Rejected %d log entries", len(self._errors))
         
         # Calculate metrics summary for each flight
-        for flight_id, flight_data in flights_by_id.items():
-            flight_data['metrics_summary'] = self._calculate_metrics_summary(flight_data['logs'])
+        for flight, _, acc in self._groups.values():
+            flight['metrics_summary'] = self._calculate_metrics_summary(acc)
         
-        self.processed_logs = list(flights_by_id.values())
+        self.processed_logs = [flight for flight, _, _ in self._groups.values()]
+        self._groups = {}
         return self.processed_logs
     
-    def _process_single_log(self, log_entry):
-        """Process a single log entry"""
-        try:
-            processed = {
-                'log_id': log_entry.get('log_id', ''),
-                'flight_id': log_entry.get('flight_id', ''),
-                'aircraft_id': log_entry.get('aircraft_id', ''),
-                'timestamp': datetime.fromisoformat(log_entry['timestamp'].replace('Z', '')),
-                'log_type': log_entry.get('log_type', ''),
-                'metrics': log_entry.get('metrics', {}),
-                'status': log_entry.get('status', 'UNKNOWN'),
-                'origin': log_entry.get('origin', ''),
-                'destination': log_entry.get('destination', '')
-            }
-            return processed
-        except Exception as e:
-            print(f"Error processing log {log_entry.get('log_id', 'unknown')}: {e}")
+    def _read_log_chunks(self, path, chunk_size):
+        """Yield lists of parsed entries from a JSON Lines file, chunk_size at a time"""
+        chunk = []
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    chunk.append(_loads(line))
+                except ValueError as e:
+                    self._errors.append((f"line {line_number}", f"invalid JSON ({e})"))
+                    continue
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+    
+    def _new_accumulator(self):
+        """Per-flight running extremes and collected values the metrics summary is computed from"""
+        # Values averaged are kept, not summed as they arrive, so the summary can fsum them
+        return {
+            'alert_count': 0,
+            'thrust_values': [],
+            'max_vibration': -inf,
+            'crosswind_values': [],
+            'min_visibility': inf,
+            'passenger_counts': []
+        }
+    
+    def _process_single_log(self, log_entry, parsed):
+        """Process a single log entry, parsing each distinct timestamp once"""
+        raw = log_entry.get('timestamp') if isinstance(log_entry, dict) else None
+        timestamp = None
+        if type(raw) is str:
+            timestamp = parsed.get(raw, False)  # False marks a string not seen yet
+            if timestamp is False:
+                try:
+                    timestamp = datetime.fromisoformat(raw.replace('Z', ''))
+                except ValueError:
+                    timestamp = None
+                parsed[raw] = timestamp
+        
+        if timestamp is None:
+            if not isinstance(log_entry, dict):
+                self._errors.append(('unknown', 'log entry is not an object'))
+            elif raw is None:
+                self._errors.append((log_entry.get('log_id', 'unknown'), 'missing timestamp'))
+            else:
+                self._errors.append((log_entry.get('log_id', 'unknown'), f"invalid timestamp {raw!r}"))
             return None
+        
+        return ProcessedLog(
+            log_entry.get('log_id', ''),
+            log_entry.get('flight_id', ''),
+            log_entry.get('aircraft_id', ''),
+            timestamp,
+            _intern(log_entry.get('log_type', '')),
+            log_entry.get('metrics', {}),
+            _intern(log_entry.get('status', 'UNKNOWN')),
+            log_entry.get('origin', ''),
+            log_entry.get('destination', '')
+        )
     
-    def _calculate_metrics_summary(self, logs):
-        """Calculate summary statistics for flight logs"""
+    def _calculate_metrics_summary(self, acc):
+        """Calculate summary statistics from a flight's accumulated metrics"""
         summary = {
             'engine_metrics': {},
             'weather_metrics': {},
             'passenger_metrics': {},
-            'alert_count': 0
+            'alert_count': acc['alert_count']
         }
         
-        engine_thrust_values = []
-        vibration_values = []
-        crosswind_values = []
-        visibility_values = []
-        passenger_counts = []
-        
-        for log in logs:
-            if log['status'] != 'NORMAL':
-                summary['alert_count'] += 1
-            
-            metrics = log['metrics']
-            
-            if log['log_type'] == 'engine_performance':
-                engine_thrust_values.append(metrics.get('engine_thrust', 0))
-                vibration_values.append(metrics.get('engine_vibration', 0))
-                
-            elif log['log_type'] == 'weather_data':
-                crosswind_values.append(metrics.get('crosswind', 0))
-                visibility_values.append(metrics.get('visibility', 0))
-                
-            elif log['log_type'] == 'passenger_load':
-                passenger_counts.append(metrics.get('passenger_count', 0))
-        
-        # Calculate statistics
-        if engine_thrust_values:
+        # Calculate statistics; fsum keeps the means accurate
+        thrust_values = acc['thrust_values']
+        if thrust_values:
             summary['engine_metrics'] = {
-                'avg_thrust': statistics.mean(engine_thrust_values),
-                'max_vibration': max(vibration_values) if vibration_values else 0
+                'avg_thrust': fsum(thrust_values) / len(thrust_values),
+                'max_vibration': acc['max_vibration']
             }
         
+        crosswind_values = acc['crosswind_values']
         if crosswind_values:
             summary['weather_metrics'] = {
-                'avg_crosswind': statistics.mean(crosswind_values),
-                'min_visibility': min(visibility_values) if visibility_values else 0
+                'avg_crosswind': fsum(crosswind_values) / len(crosswind_values),
+                'min_visibility': acc['min_visibility']
             }
         
+        passenger_counts = acc['passenger_counts']
         if passenger_counts:
             summary['passenger_metrics'] = {
-                'avg_passengers': statistics.mean(passenger_counts),
+                'avg_passengers': fsum(passenger_counts) / len(passenger_counts),
                 'total_passengers': sum(passenger_counts)
             }
         
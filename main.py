@@ -5,29 +5,211 @@ Main Application Entry Point
 """
 import sys
 import os
+import atexit
+import copy
+import gc
+import importlib
 import json
+import random
+import sched
 import time
 from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
 from typing import Dict, List, Optional
 import threading
-from queue import Queue
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from queue import Empty, Queue
 
-# Add modules to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    
+    def _dumps_pretty(obj):
+        return orjson.dumps(obj, default=dict, option=orjson.OPT_INDENT_2)
+    
+    def _dumps_line(obj):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, default=dict)
+except ImportError:  # Fall back to the stdlib codec
+    _loads = json.loads
+    
+    def _dumps_pretty(obj):
+        return json.dumps(obj, indent=2, default=dict).encode()
+    
+    def _dumps_line(obj):
+        return json.dumps(obj, default=str).encode() + b'\n'
+    
+    def _dumps(obj):
+        return json.dumps(obj, default=dict).encode()
+
+try:
+    from modules.records import MappingRecord
+except ImportError:  # Modules sit next to main.py rather than in the package
+    from records import MappingRecord
+
+def _atomic_write_bytes(path, data):
+    """Replace path with data in one rename so a crash never leaves it half-written"""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _write_json(path, obj):
+    """Write obj to path as indented JSON and return the bytes written"""
+    data = _dumps_pretty(obj)
+    _atomic_write_bytes(path, data)
+    return data
+
+# Number of flights produced by the sample data generator
+SAMPLE_FLIGHT_COUNT = 50
+
+# Predicted delay (minutes) above which a DELAY_PREDICTION alert is raised
+DELAY_ALERT_MINUTES = 30
+
+# Editable thresholds per config category as (key, prompt, type)
+THRESHOLD_FIELDS = {
+    'weather': [
+        ('crosswind_max_knots', "Crosswind Max (knots)", int),
+        ('visibility_min_meters', "Visibility Min (meters)", int)
+    ],
+    'maintenance': [
+        ('engine_vibration_threshold', "Engine Vibration Threshold", float),
+        ('cabin_temp_max_celsius', "Cabin Temp Max (C)", int)
+    ],
+    'operations': [
+        ('runway_queue_max_minutes', "Runway Queue Max (minutes)", int),
+        ('boarding_max_minutes', "Boarding Max (minutes)", int)
+    ],
+    'crew': [
+        ('max_duty_hours', "Max Duty Hours", int),
+        ('min_rest_hours', "Min Rest Hours", int)
+    ]
+}
+
+# Parsed configuration per path, reused until the file's mtime changes
+_CONFIG_CACHE = {}
+
+# Component key -> (display name, module, class); each is imported on first use
+_COMPONENT_SPECS = {
+    'log_processor': ("Log Processor", 'modules.log_processor', 'LogProcessor'),
+    'delay_predictor': ("Delay Predictor", 'modules.delay_predictor', 'DelayPredictor'),
+    'crew_optimizer': ("Crew Optimizer", 'modules.crew_optimizer', 'CrewOptimizer'),
+    'load_predictor': ("Load Predictor", 'modules.load_predictor', 'LoadPredictor'),
+    'health_monitor': ("Health Monitor", 'modules.health_monitor', 'HealthMonitor'),
+    'route_monitor': ("Route Monitor", 'modules.route_monitor', 'RouteMonitor'),
+    'dashboard': ("Dashboard", 'modules.dashboard', 'Dashboard'),
+    'reporter': ("Reporter", 'modules.reporter', 'ReportGenerator')
+}
+
+@dataclass(slots=True)
+class FlightRecord(MappingRecord):
+    flight_id: str
+    aircraft_id: str
+    aircraft_type: str
+    route: str
+    departure_airport: str
+    arrival_airport: str
+    scheduled_departure: str
+    scheduled_arrival: str
+    actual_departure: Optional[str]
+    actual_arrival: Optional[str]
+    status: str
+    gate: str
+    runway_queue_minutes: int
+    boarding_time_minutes: int
 
-from modules.log_processor import LogProcessor
-from modules.delay_predictor import DelayPredictor
-from modules.crew_optimizer import CrewOptimizer
-from modules.load_predictor import LoadPredictor
-from modules.health_monitor import HealthMonitor
-from modules.route_monitor import RouteMonitor
-from modules.dashboard import Dashboard
-from modules.reporter import ReportGenerator as Reporter
+@dataclass(slots=True)
+class PassengerRecord(MappingRecord):
+    flight_id: str
+    passenger_count: int
+    capacity: int
+    load_factor: float
+    business_class: int
+    economy_class: int
+    check_in_complete: bool
+    special_assistance: int
+
+@dataclass(slots=True)
+class CrewRecord(MappingRecord):
+    crew_id: str
+    name: str
+    role: str
+    flight_id: str
+    duty_start: str
+    duty_end: str
+    total_duty_hours: int
+    rest_hours: int
+    base_airport: str
+    status: str
+
+@dataclass(slots=True)
+class WeatherRecord(MappingRecord):
+    flight_id: str
+    airport: str
+    timestamp: str
+    temperature_c: int
+    wind_speed_knots: int
+    crosswind_knots: int
+    visibility_meters: int
+    turbulence_level: int
+    thunderstorm: bool
+    precipitation_mm: int
+    cloud_cover_percent: int
+
+@dataclass(slots=True)
+class MaintenanceRecord(MappingRecord):
+    flight_id: str
+    aircraft_id: str
+    timestamp: str
+    engine_thrust_percent: float
+    engine_vibration: float
+    cabin_pressure: float
+    cabin_temperature: float
+    fuel_flow_rate: int
+    oil_temperature: float
+    altitude_ft: int
+    airspeed_knots: int
+    turbulence_experienced: int
+
+class _LazyComponents:
+    """Component registry that imports and builds each component on first access"""
+    
+    def __init__(self, config: Dict):
+        self._config = config
+        self._cache = {}
+    
+    def __getitem__(self, key: str):
+        if key not in self._cache:
+            name, module_name, class_name = _COMPONENT_SPECS[key]
+            try:
+                component_class = getattr(importlib.import_module(module_name), class_name)
+                self._cache[key] = component_class(self._config)
+                print(f"  ✓ {name}")
+            except Exception as e:
+                print(f"  ✗ {name}: {str(e)}")
+                self._cache[key] = None
+        return self._cache[key]
+    
+    def get(self, key: str, default=None):
+        """Return the component for key, or default if no such component exists"""
+        return self[key] if key in _COMPONENT_SPECS else default
+    
+    def items(self):
+        """Return (key, component) pairs, loading any component not yet used"""
+        return [(key, self[key]) for key in _COMPONENT_SPECS]
 
 class AirlineOperationsSystem:
     """Main class for Airline Operations Automation System"""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, seed: Optional[int] = None):
         """Initialize the airline operations system"""
         if config_path is None:
             config_path = os.path.join(os.path.dirname(__file__), 'airline_config.json')
@@ -37,17 +219,35 @@ class AirlineOperationsSystem:
         
         # Load configuration
         self.config = self._load_config(config_path)
+        self._config_pretty = None  # Indented JSON view, rebuilt only after edits
+        self._config_dirty = False  # Threshold edits not yet written to disk
         
         # Initialize directories
         self._setup_directories()
+        # Append-only descriptor: each drain is one atomic write of JSON lines. The health
+        # monitor's text log is critical_flight_alerts.log, so this stream keeps its own file
+        self._critical_fd = os.open('logs/critical_flight_alerts.jsonl',
+                                    os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(self.close)
+        
+        # Backups are written on this thread so the menu never waits on disk
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='backup-writer')
+        self._pending_writes = []
         
         # Initialize components
         self.components = self._initialize_components()
         
         # Data storage
         self.flights_data = {}
+        self._build_indexes()
         self.alerts_queue = Queue()
-        self.is_running = False
+        self.recent_alerts = deque(maxlen=10)  # Tail shown on the dashboard
+        self.alert_history = deque(maxlen=10000)  # Bounded history for reports
+        self._alerts_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stop.set()  # Set whenever real-time monitoring is not running
+        self._scheduler = None  # Scheduler of the monitoring run in progress
+        self._rng = random.Random(seed)  # Sample data is reproducible when seeded
         
         print(f"\n✓ System initialized for {self.config['airline_name']}")
         print(f"✓ Hub Airport: {self.config['hub_airport']}")
@@ -55,7 +255,9 @@ class AirlineOperationsSystem:
     
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
-        if not os.path.exists(config_path):
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
             # Create default configuration
             default_config = {
                 "airline_name": "Global Airways",
@@ -65,13 +267,47 @@ class AirlineOperationsSystem:
                     "maintenance": {"engine_vibration_threshold": 7.5}
                 }
             }
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
+            self._save_config(config_path, default_config)
             print(f"⚠ Created default configuration at {config_path}")
             return default_config
         
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        # Each caller gets its own copy, so threshold edits never leak into the cached parse
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached is not None and cached[0] == mtime:
+            return copy.deepcopy(cached[1])
+        
+        with open(config_path, 'rb') as f:
+            config = _loads(f.read())
+        self._validate_config(config_path, config)  # Only a valid parse is cached
+        _CONFIG_CACHE[config_path] = (mtime, config)
+        return copy.deepcopy(config)
+    
+    def _validate_config(self, config_path: str, config) -> None:
+        """Check the configuration's shape, raising ValueError on the first problem"""
+        if not isinstance(config, dict):
+            raise ValueError(f"{config_path}: configuration must be a JSON object")
+        
+        thresholds = config.get('thresholds', {})
+        if not isinstance(thresholds, dict):
+            raise ValueError(f"{config_path}: 'thresholds' must be an object")
+        for category, values in thresholds.items():
+            if not isinstance(values, dict):
+                raise ValueError(f"{config_path}: thresholds.{category} must be an object")
+            for name, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"{config_path}: thresholds.{category}.{name} must be a number")
+    
+    def _save_config(self, config_path='airline_config.json', config=None):
+        """Write the configuration back to disk as indented JSON"""
+        pretty = _write_json(config_path, self.config if config is None else config)
+        if config is None:
+            self._config_pretty = pretty.decode()
+            self._config_dirty = False
+    
+    def _flush_config_if_dirty(self):
+        """Write the configuration once if it has unsaved edits"""
+        if self._config_dirty:
+            self._save_config()
     
     def _setup_directories(self):
         """Create necessary directories"""
@@ -85,19 +321,18 @@ class AirlineOperationsSystem:
         ]
         
         for directory in directories:
-            os.makedirs(directory, exist_ok=True)
+            Path(directory).mkdir(parents=True, exist_ok=True)
         
         # Create empty log files if they don't exist
         log_files = [
             'logs/aircraft_health_alerts.log',
             'logs/critical_flight_alerts.log',
+            'logs/critical_flight_alerts.jsonl',
             'logs/system.log'
         ]
         
         for log_file in log_files:
-            if not os.path.exists(log_file):
-                with open(log_file, 'w') as f:
-                    f.write(f"Log file created: {datetime.now().isoformat()}\n")
+            Path(log_file).touch(exist_ok=True)
     
     def _initialize_components(self):
         """Initialize all system components"""
@@ -105,30 +340,8 @@ class AirlineOperationsSystem:
         print("INITIALIZING SYSTEM COMPONENTS")
         print("-" * 80)
         
-        components = {}
-        
-        # Initialize each component
-        component_configs = [
-            ("Log Processor", LogProcessor, self.config),
-            ("Delay Predictor", DelayPredictor, self.config),
-            ("Crew Optimizer", CrewOptimizer, self.config),
-            ("Load Predictor", LoadPredictor, self.config),
-            ("Health Monitor", HealthMonitor, self.config),
-            ("Route Monitor", RouteMonitor, self.config),
-
-            ("Dashboard", Dashboard, self.config),
-            ("Reporter", Reporter, self.config)
-        ]
-        
-        for name, component_class, config in component_configs:
-            try:
-                components[name.lower().replace(' ', '_')] = component_class(config)
-                print(f"  ✓ {name}")
-            except Exception as e:
-                print(f"  ✗ {name}: {str(e)}")
-                components[name.lower().replace(' ', '_')] = None
-        
-        return components
+        # Components are imported and constructed when first used
+        return _LazyComponents(self.config)
     
     def load_sample_data(self):
         """Load sample flight data for demonstration"""
@@ -142,6 +355,7 @@ class AirlineOperationsSystem:
         if self.components['log_processor']:
             self.components['log_processor'].ingest_logs(sample_data)
             self.flights_data = self.components['log_processor'].get_all_logs()
+            self._build_indexes()
             print(f"✓ Loaded {len(self.flights_data.get('flights', []))} sample flights")
             print(f"✓ Generated {len(self.flights_data.get('passengers', []))} passenger records")
             print(f"✓ Created {len(self.flights_data.get('crew', []))} crew assignments")
@@ -150,12 +364,76 @@ class AirlineOperationsSystem:
     
     def _generate_sample_data(self) -> Dict:
         """Generate comprehensive sample data"""
-        import random
-        from datetime import datetime, timedelta
-        
         base_time = datetime.now()
-        aircraft_types = list(self.config['aircraft_fleet'].keys())
+        
+        # Read everything needed from the config once
+        fleet = self.config['aircraft_fleet']
+        aircraft_types = list(fleet)
+        fleet_capacity = {t: spec["capacity"] for t, spec in fleet.items()}
+        fleet_crew = {t: spec["crew_required"] for t, spec in fleet.items()}
         routes = self.config['routes']['domestic'] + self.config['routes']['international']
+        base_airports = self.config["base_airports"]
+        code = self.config['airline_code']
+        n = SAMPLE_FLIGHT_COUNT
+        span = range(n)
+        rng = self._rng
+        
+        # Draw every column in one pass; records are only assembled at the end
+        chosen_types = rng.choices(aircraft_types, k=n)
+        chosen_routes = rng.choices(routes, k=n)
+        aircraft_ids = rng.choices(['VT-AXB', 'VT-BXC', 'VT-CXD', 'VT-EXF', 'VT-GXH'], k=n)
+        arrival_offsets = rng.choices(range(2, 9), k=n)
+        statuses = rng.choices(["SCHEDULED", "BOARDING", "DEPARTED", "IN_AIR", "LANDED"], k=n)
+        gates = rng.choices(range(1, 51), k=n)
+        runway_queues = rng.choices(range(0, 46), k=n)
+        boarding_times = rng.choices(range(20, 61), k=n)
+        
+        # Passenger columns
+        capacities = [fleet_capacity[t] for t in chosen_types]
+        passenger_counts = [rng.randint(int(c * 0.6), int(c * 1.1)) for c in capacities]
+        business = [rng.randint(10, min(40, p)) for p in passenger_counts]
+        economy_offsets = [rng.randint(10, min(40, p)) for p in passenger_counts]
+        check_ins = [rng.random() > 0.2 for _ in span]
+        assistance = rng.choices(range(0, 6), k=n)
+        
+        # Crew columns, one entry per crew seat across all flights
+        crew_counts = [fleet_crew[t] for t in chosen_types]
+        crew_total = sum(crew_counts)
+        duty_offsets = rng.choices(range(3, 11), k=crew_total)
+        duty_hours = rng.choices(range(4, 13), k=crew_total)
+        rest_hours = rng.choices(range(8, 25), k=crew_total)
+        crew_bases = rng.choices(base_airports, k=crew_total)
+        crew_statuses = rng.choices(["ACTIVE", "RESTING", "STANDBY"], k=crew_total)
+        
+        # Identifiers are formatted once per column rather than inside the assembly loop
+        flight_ids = [f"{code}{1000 + i}" for i in span]
+        crew_seats = [(i, j) for i in span for j in range(crew_counts[i])]
+        crew_ids = [f"C{1000 + i * 10 + j}" for i, j in crew_seats]
+        crew_names = [f"Crew Member {i}-{j}" for i, j in crew_seats]
+        
+        # Weather columns
+        temperatures = rng.choices(range(15, 36), k=n)
+        wind_speeds = rng.choices(range(5, 51), k=n)
+        crosswinds = rng.choices(range(5, 46), k=n)
+        visibilities = rng.choices(range(500, 5001), k=n)
+        turbulence = rng.choices(range(1, 11), k=n)
+        thunderstorms = [rng.random() < 0.1 for _ in span]
+        precipitation = rng.choices(range(0, 51), k=n)
+        cloud_cover = rng.choices(range(0, 101), k=n)
+        
+        # Hourly ISO timestamps shared by departures, arrivals and duty windows
+        iso_times = [(base_time + timedelta(hours=h)).isoformat() for h in range(-1, n + 11)]
+        
+        # Maintenance columns
+        thrusts = [rng.uniform(75, 95) for _ in span]
+        vibrations = [rng.uniform(2.0, 9.0) for _ in span]
+        pressures = [rng.uniform(800, 1013) for _ in span]
+        cabin_temps = [rng.uniform(18, 32) for _ in span]
+        fuel_flows = rng.choices(range(1000, 3001), k=n)
+        oil_temps = [rng.uniform(85, 115) for _ in span]
+        altitudes = rng.choices(range(10000, 40001), k=n)
+        airspeeds = rng.choices(range(400, 551), k=n)
+        turbulence_experienced = rng.choices(range(0, 9), k=n)
         
         data = {
             "flights": [],
@@ -165,233 +443,293 @@ class AirlineOperationsSystem:
             "maintenance": []
         }
         
-        # Generate 50 sample flights
-        for i in range(50):
-            flight_id = f"{self.config['airline_code']}{1000 + i}"
-            aircraft_type = random.choice(aircraft_types)
-            route = random.choice(routes)
+        seat = 0
+        for i in span:
+            flight_id = flight_ids[i]
+            aircraft_type = chosen_types[i]
+            route = chosen_routes[i]
             departure, arrival = route.split('-')
+            aircraft_id = aircraft_ids[i]
             
-            # Flight data
-            flight = {
-                "flight_id": flight_id,
-                "aircraft_id": f"VT-{random.choice(['AXB', 'BXC', 'CXD', 'EXF', 'GXH'])}",
-                "aircraft_type": aircraft_type,
-                "route": route,
-                "departure_airport": departure,
-                "arrival_airport": arrival,
-                "scheduled_departure": (base_time + timedelta(hours=i)).isoformat(),
-                "scheduled_arrival": (base_time + timedelta(hours=i + random.randint(2, 8))).isoformat(),
-                "actual_departure": None,
-                "actual_arrival": None,
-                "status": random.choice(["SCHEDULED", "BOARDING", "DEPARTED", "IN_AIR", "LANDED"]),
-                "gate": f"Gate {random.randint(1, 50)}",
-                "runway_queue_minutes": random.randint(0, 45),
-                "boarding_time_minutes": random.randint(20, 60)
-            }
-            data["flights"].append(flight)
+            data["flights"].append(FlightRecord(
+                flight_id=flight_id,
+                aircraft_id=aircraft_id,
+                aircraft_type=aircraft_type,
+                route=route,
+                departure_airport=departure,
+                arrival_airport=arrival,
+                scheduled_departure=iso_times[i + 1],
+                scheduled_arrival=iso_times[i + 1 + arrival_offsets[i]],
+                actual_departure=None,
+                actual_arrival=None,
+                status=statuses[i],
+                gate=f"Gate {gates[i]}",
+                runway_queue_minutes=runway_queues[i],
+                boarding_time_minutes=boarding_times[i]
+            ))
             
-            # Passenger data
-            capacity = self.config['aircraft_fleet'][aircraft_type]["capacity"]
-            passenger_count = random.randint(int(capacity * 0.6), int(capacity * 1.1))
-            data["passengers"].append({
-                "flight_id": flight_id,
-                "passenger_count": passenger_count,
-                "capacity": capacity,
-                "load_factor": (passenger_count / capacity) * 100,
-                "business_class": random.randint(10, min(40, passenger_count)),
-                "economy_class": passenger_count - random.randint(10, min(40, passenger_count)),
-                "check_in_complete": random.random() > 0.2,
-                "special_assistance": random.randint(0, 5)
-            })
+            capacity = capacities[i]
+            passenger_count = passenger_counts[i]
+            data["passengers"].append(PassengerRecord(
+                flight_id=flight_id,
+                passenger_count=passenger_count,
+                capacity=capacity,
+                load_factor=(passenger_count / capacity) * 100,
+                business_class=business[i],
+                economy_class=passenger_count - economy_offsets[i],
+                check_in_complete=check_ins[i],
+                special_assistance=assistance[i]
+            ))
             
-            # Crew data
-            crew_required = self.config['aircraft_fleet'][aircraft_type]["crew_required"]
-            for j in range(crew_required):
-                role = "PILOT" if j < 2 else "CABIN_CREW"
-                data["crew"].append({
-                    "crew_id": f"C{1000 + i * 10 + j}",
-                    "name": f"Crew Member {i}-{j}",
-                    "role": role,
-                    "flight_id": flight_id,
-                    "duty_start": (base_time + timedelta(hours=i - 1)).isoformat(),
-                    "duty_end": (base_time + timedelta(hours=i + random.randint(3, 10))).isoformat(),
-                    "total_duty_hours": random.randint(4, 12),
-                    "rest_hours": random.randint(8, 24),
-                    "base_airport": random.choice(self.config["base_airports"]),
-                    "status": random.choice(["ACTIVE", "RESTING", "STANDBY"])
-                })
+            for j in range(crew_counts[i]):
+                data["crew"].append(CrewRecord(
+                    crew_id=crew_ids[seat],
+                    name=crew_names[seat],
+                    role="PILOT" if j < 2 else "CABIN_CREW",
+                    flight_id=flight_id,
+                    duty_start=iso_times[i],
+                    duty_end=iso_times[i + 1 + duty_offsets[seat]],
+                    total_duty_hours=duty_hours[seat],
+                    rest_hours=rest_hours[seat],
+                    base_airport=crew_bases[seat],
+                    status=crew_statuses[seat]
+                ))
+                seat += 1
             
-            # Weather data
-            data["weather"].append({
-                "flight_id": flight_id,
-                "airport": departure,
-                "timestamp": (base_time + timedelta(hours=i)).isoformat(),
-                "temperature_c": random.randint(15, 35),
-                "wind_speed_knots": random.randint(5, 50),
-                "crosswind_knots": random.randint(5, 45),
-                "visibility_meters": random.randint(500, 5000),
-                "turbulence_level": random.randint(1, 10),
-                "thunderstorm": random.random() < 0.1,
-                "precipitation_mm": random.randint(0, 50),
-                "cloud_cover_percent": random.randint(0, 100)
-            })
+            data["weather"].append(WeatherRecord(
+                flight_id=flight_id,
+                airport=departure,
+                timestamp=iso_times[i + 1],
+                temperature_c=temperatures[i],
+                wind_speed_knots=wind_speeds[i],
+                crosswind_knots=crosswinds[i],
+                visibility_meters=visibilities[i],
+                turbulence_level=turbulence[i],
+                thunderstorm=thunderstorms[i],
+                precipitation_mm=precipitation[i],
+                cloud_cover_percent=cloud_cover[i]
+            ))
             
-            # Maintenance data
-            data["maintenance"].append({
-                "flight_id": flight_id,
-                "aircraft_id": flight["aircraft_id"],
-                "timestamp": (base_time + timedelta(hours=i)).isoformat(),
-                "engine_thrust_percent": random.uniform(75, 95),
-                "engine_vibration": random.uniform(2.0, 9.0),
-                "cabin_pressure": random.uniform(800, 1013),
-                "cabin_temperature": random.uniform(18, 32),
-                "fuel_flow_rate": random.randint(1000, 3000),
-                "oil_temperature": random.uniform(85, 115),
-                "altitude_ft": random.randint(10000, 40000),
-                "airspeed_knots": random.randint(400, 550),
-                "turbulence_experienced": random.randint(0, 8)
-            })
+            data["maintenance"].append(MaintenanceRecord(
+                flight_id=flight_id,
+                aircraft_id=aircraft_id,
+                timestamp=iso_times[i + 1],
+                engine_thrust_percent=thrusts[i],
+                engine_vibration=vibrations[i],
+                cabin_pressure=pressures[i],
+                cabin_temperature=cabin_temps[i],
+                fuel_flow_rate=fuel_flows[i],
+                oil_temperature=oil_temps[i],
+                altitude_ft=altitudes[i],
+                airspeed_knots=airspeeds[i],
+                turbulence_experienced=turbulence_experienced[i]
+            ))
         
         return data
     
+    def _build_indexes(self):
+        """Index flights_data by the keys used in the search menu"""
+        self._flight_by_id = {}
+        self._flights_by_aircraft = defaultdict(list)
+        self._flights_by_route = defaultdict(list)
+        self._crew_by_id = {}
+        self._latest_maint = {}
+        
+        for flight in self.flights_data.get('flights', []):
+            self._flight_by_id.setdefault(flight.get('flight_id'), flight)
+            self._flights_by_aircraft[flight.get('aircraft_id')].append(flight)
+            self._flights_by_route[flight.get('route')].append(flight)
+        
+        for member in self.flights_data.get('crew', []):
+            self._crew_by_id.setdefault(member.get('crew_id'), member)
+        
+        # Keep only the most recent maintenance record per aircraft
+        latest = self._latest_maint
+        for record in self.flights_data.get('maintenance', []):
+            aircraft_id = record.get('aircraft_id')
+            current = latest.get(aircraft_id)
+            if current is None or record.get('timestamp', '') > current.get('timestamp', ''):
+                latest[aircraft_id] = record
+    
     def run_real_time_monitoring(self):
         """Run real-time monitoring of flights"""
         print("\n" + "-" * 80)
         print("STARTING REAL-TIME MONITORING")
         print("-" * 80)
         
-        self.is_running = True
-        
-        # Start monitoring threads
-        threads = []
+        self._stop.clear()
         
-        # Health monitoring thread
-        health_thread = threading.Thread(target=self._monitor_health, daemon=True)
-        threads.append(health_thread)
-        
-        # Delay prediction thread
-        delay_thread = threading.Thread(target=self._predict_delays, daemon=True)
-        threads.append(delay_thread)
-        
-        # Crew optimization thread
-        crew_thread = threading.Thread(target=self._optimize_crew, daemon=True)
-        threads.append(crew_thread)
-        
-        # Dashboard update thread
-        dashboard_thread = threading.Thread(target=self._update_dashboard, daemon=True)
-        threads.append(dashboard_thread)
+        # All periodic tasks share one scheduler on the main thread; waiting on
+        # the stop event lets stop_monitoring() cut any pending sleep short
+        scheduler = self._scheduler = sched.scheduler(time.monotonic, self._stop.wait)
+        tasks = [
+            ('health_monitor', 30, self._monitor_health),  # Check every 30 seconds
+            ('delay_predictor', 60, self._predict_delays),  # Predict every minute
+            ('crew_optimizer', 300, self._optimize_crew),  # Optimize every 5 minutes
+            ('dashboard', 60, self._update_dashboard)  # Update every minute
+        ]
         
-        # Start all threads
-        for thread in threads:
-            thread.start()
+        # Components are resolved once here; tasks without one are never scheduled
+        for key, interval, task in tasks:
+            component = self.components.get(key)
+            if component is not None:
+                self._schedule_every(scheduler, interval, partial(task, component))
         
         print("✓ Real-time monitoring started")
         print("✓ Press Ctrl+C to stop\n")
         
-        # Keep main thread alive
         try:
-            while self.is_running:
-                time.sleep(1)
-                
-                # Process alerts
-                self._process_alerts()
-                
+            scheduler.run()
         except KeyboardInterrupt:
             print("\n\nStopping monitoring...")
-            self.is_running = False
+            self.stop_monitoring()
     
-    def _monitor_health(self):
-        """Monitor aircraft health in real-time"""
-        while self.is_running:
-            try:
-                if self.components['health_monitor'] and self.flights_data:
-                    alerts = self.components['health_monitor'].monitor(self.flights_data)
-                    for alert in alerts:
-                        self.alerts_queue.put(alert)
-            except Exception as e:
-                print(f"Health monitoring error: {str(e)}")
+    @property
+    def is_running(self) -> bool:
+        """True while real-time monitoring is active"""
+        return not self._stop.is_set()
+    
+    def stop_monitoring(self):
+        """Stop real-time monitoring; safe to call from any thread"""
+        self._stop.set()
+        
+        # Once the event is set every wait returns at once, so queued ticks are
+        # cancelled to let scheduler.run() return instead of spinning until they fall due
+        scheduler = self._scheduler
+        if scheduler is not None:
+            for event in scheduler.queue:
+                try:
+                    scheduler.cancel(event)
+                except ValueError:
+                    pass  # Already popped to run; tick() sees the event and stops
+    
+    def _schedule_every(self, scheduler, interval, task):
+        """Run task on the scheduler every interval seconds while monitoring"""
+        def tick():
+            if self._stop.is_set():
+                return
+            task()
             
-            time.sleep(30)  # Check every 30 seconds
+            # Alerts are only produced by scheduled tasks, so drain right after each one
+            if not self.alerts_queue.empty():
+                self._process_alerts()
+            if not self._stop.is_set():
+                scheduler.enter(interval, 0, tick)
+        
+        scheduler.enter(0, 0, tick)
     
-    def _predict_delays(self):
+    def _monitor_health(self, health_monitor):
+        """Monitor aircraft health in real-time"""
+        try:
+            if self.flights_data:
+                put = self.alerts_queue.put
+                for alert in health_monitor.monitor(self.flights_data):
+                    put(alert)
+        except Exception as e:
+            print(f"Health monitoring error: {str(e)}")
+    
+    def _predict_delays(self, delay_predictor):
         """Predict flight delays in real-time"""
-        while self.is_running:
-            try:
-                if self.components['delay_predictor'] and self.flights_data:
-                    predictions = self.components['delay_predictor'].predict(self.flights_data)
-                    
-                    # Check for significant delays
-                    for prediction in predictions:
-                        if prediction.get('delay_minutes', 0) > 30:
-                            alert = {
-                                "type": "DELAY_PREDICTION",
-                                "severity": "WARNING",
-                                "flight_id": prediction['flight_id'],
-                                "message": f"Predicted delay: {prediction['delay_minutes']} minutes",
-                                "details": prediction['reasons'],
-                                "timestamp": datetime.now().isoformat()
-                            }
-                            self.alerts_queue.put(alert)
-            except Exception as e:
-                print(f"Delay prediction error: {str(e)}")
-            
-            time.sleep(60)  # Predict every minute
+        try:
+            if self.flights_data:
+                predictions = delay_predictor.predict(self.flights_data)
+                now_iso = datetime.now().isoformat()
+                put = self.alerts_queue.put
+                
+                # Check for significant delays
+                significant = [p for p in predictions if p.get('delay_minutes', 0) > DELAY_ALERT_MINUTES]
+                for prediction in significant:
+                    alert = {
+                        "type": "DELAY_PREDICTION",
+                        "severity": "WARNING",
+                        "flight_id": prediction['flight_id'],
+                        "message": f"Predicted delay: {prediction['delay_minutes']} minutes",
+                        "details": [template.format(value) for template, value in prediction['reasons']],
+                        "timestamp": now_iso
+                    }
+                    put(alert)
+        except Exception as e:
+            print(f"Delay prediction error: {str(e)}")
     
-    def _optimize_crew(self):
+    def _optimize_crew(self, crew_optimizer):
         """Optimize crew scheduling in real-time"""
-        while self.is_running:
-            try:
-                if self.components['crew_optimizer'] and self.flights_data:
-                    optimizations = self.components['crew_optimizer'].optimize(self.flights_data)
-                    
-                    # Check for crew shortages
-                    for issue in optimizations.get('issues', []):
-                        if 'shortage' in issue.lower() or 'unavailable' in issue.lower():
-                            alert = {
-                                "type": "CREW_SHORTAGE",
-                                "severity": "CRITICAL",
-                                "message": issue,
-                                "timestamp": datetime.now().isoformat()
-                            }
-                            self.alerts_queue.put(alert)
-            except Exception as e:
-                print(f"Crew optimization error: {str(e)}")
-            
-            time.sleep(300)  # Optimize every 5 minutes
+        try:
+            if self.flights_data:
+                optimizations = crew_optimizer.optimize(self.flights_data)
+                now_iso = datetime.now().isoformat()
+                put = self.alerts_queue.put
+                
+                # Check for crew shortages
+                for issue in optimizations.get('issues', []):
+                    lowered = issue.lower()
+                    if 'shortage' in lowered or 'unavailable' in lowered:
+                        alert = {
+                            "type": "CREW_SHORTAGE",
+                            "severity": "CRITICAL",
+                            "message": issue,
+                            "timestamp": now_iso
+                        }
+                        put(alert)
+        except Exception as e:
+            print(f"Crew optimization error: {str(e)}")
     
-    def _update_dashboard(self):
+    def _update_dashboard(self, dashboard):
         """Update operations dashboard in real-time"""
-        while self.is_running:
-            try:
-                if self.components['dashboard'] and self.flights_data:
-                    # Get current system status
-                    status = {
-                        'flights': self.flights_data.get('flights', []),
-                        'alerts': list(self.alerts_queue.queue)[-10:],  # Last 10 alerts
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    # Update dashboard
-                    self.components['dashboard'].update(status)
-            except Exception as e:
-                print(f"Dashboard update error: {str(e)}")
-            
-            time.sleep(60)  # Update every minute
+        try:
+            if self.flights_data:
+                # Get current system status
+                with self._alerts_lock:
+                    alerts_snapshot = list(self.recent_alerts)
+                status = {
+                    'flights': self.flights_data.get('flights', []),
+                    'alerts': alerts_snapshot,  # Last 10 alerts
+                    'timestamp': datetime.now().isoformat()
+                }
+                
+                # Update dashboard
+                dashboard.update(status)
+        except Exception as e:
+            print(f"Dashboard update error: {str(e)}")
     
     def _process_alerts(self):
         """Process queued alerts"""
-        while not self.alerts_queue.empty():
-            alert = self.alerts_queue.get()
+        now_iso = datetime.now().isoformat()
+        critical = []
+        get = self.alerts_queue.get_nowait
+        alert_system = self.components.get('alert_system')
+        while True:
+            try:
+                alert = get()
+            except Empty:
+                break
+            with self._alerts_lock:
+                self.recent_alerts.append(alert)
+                self.alert_history.append(alert)
             
             # Send to alert system
-            if self.components['alert_system']:
-                self.components['alert_system'].send_alert(alert)
+            if alert_system:
+                alert_system.send_alert(alert)
             
-            # Log critical alerts
-            if alert.get('severity') in ['CRITICAL', 'EMERGENCY']:
-                with open('logs/critical_flight_alerts.log', 'a') as f:
-                    f.write(f"{datetime.now().isoformat()} - {alert}\n")
+            if alert.get('severity') in ('CRITICAL', 'EMERGENCY'):
+                critical.append(_dumps_line({'ts': now_iso, **alert}))
+        
+        # Log critical alerts in one write per drain, resuming after any short write
+        if critical:
+            pending = memoryview(b''.join(critical))
+            try:
+                while pending:
+                    pending = pending[os.write(self._critical_fd, pending):]
+            except OSError as e:
+                print(f"Critical alert log error: {str(e)}")
+    
+    def close(self):
+        """Save pending config edits, finish backups and release open log handles"""
+        self._flush_config_if_dirty()
+        self._wait_for_writes()
+        self._io_pool.shutdown()
+        if self._critical_fd is not None:
+            os.close(self._critical_fd)
+            self._critical_fd = None
     
     def generate_daily_report(self):
         """Generate daily operations report"""
@@ -406,7 +744,7 @@ class AirlineOperationsSystem:
                 'crew': self.flights_data.get('crew', []),
                 'weather': self.flights_data.get('weather', []),
                 'maintenance': self.flights_data.get('maintenance', []),
-                'alerts': list(self.alerts_queue.queue),
+                'alerts': list(self.alert_history),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -419,6 +757,10 @@ class AirlineOperationsSystem:
                 print(f"✓ PDF report generated: {pdf_path}")
             except:
                 print("✗ PDF generation not available")
+            
+            # Drop the report's references to every record before returning
+            del report_data
+            gc.collect()
     
     def show_dashboard(self):
         """Display real-time operations dashboard"""
@@ -446,8 +788,8 @@ class AirlineOperationsSystem:
         print("-" * 40)
         if self.components['delay_predictor']:
             delays = self.components['delay_predictor'].predict(self.flights_data)
-            delayed_flights = [d for d in delays if d.get('delay_minutes', 0) > 0]
-            print(f"✓ Delay prediction completed: {len(delayed_flights)} flights with delays")
+            delayed_count = sum(1 for d in delays if d.get('delay_minutes', 0) > 0)
+            print(f"✓ Delay prediction completed: {delayed_count} flights with delays")
         
         # 4. Crew Optimization
         print("\n3. CREW SCHEDULING OPTIMIZATION")
@@ -511,6 +853,7 @@ class AirlineOperationsSystem:
             elif choice == '6':
                 self._configuration_menu()
             elif choice == '7':
+                self._flush_config_if_dirty()
                 print("\nExiting Airline Operations System. Goodbye!")
                 break
             else:
@@ -548,11 +891,9 @@ class AirlineOperationsSystem:
     
     def _search_flight(self, flight_id: str):
         """Search for a specific flight"""
-        flights = self.flights_data.get('flights', [])
-        found_flights = [f for f in flights if f.get('flight_id') == flight_id]
+        flight = self._flight_by_id.get(flight_id)
         
-        if found_flights:
-            flight = found_flights[0]
+        if flight:
             print(f"\nFlight: {flight_id}")
             print(f"  Route: {flight.get('route')}")
             print(f"  Status: {flight.get('status')}")
@@ -569,8 +910,7 @@ class AirlineOperationsSystem:
     
     def _search_aircraft(self, aircraft_id: str):
         """Search for a specific aircraft"""
-        flights = self.flights_data.get('flights', [])
-        aircraft_flights = [f for f in flights if f.get('aircraft_id') == aircraft_id]
+        aircraft_flights = self._flights_by_aircraft.get(aircraft_id)
         
         if aircraft_flights:
             print(f"\nAircraft: {aircraft_id}")
@@ -579,11 +919,9 @@ class AirlineOperationsSystem:
             print(f"  Type: {aircraft_flights[0].get('aircraft_type')}")
             
             # Get maintenance data
-            maintenance = self.flights_data.get('maintenance', [])
-            aircraft_maintenance = [m for m in maintenance if m.get('aircraft_id') == aircraft_id]
+            latest = self._latest_maint.get(aircraft_id)
             
-            if aircraft_maintenance:
-                latest = max(aircraft_maintenance, key=lambda x: x.get('timestamp', ''))
+            if latest:
                 print(f"  Latest Engine Vibration: {latest.get('engine_vibration', 0):.2f}")
                 print(f"  Latest Cabin Pressure: {latest.get('cabin_pressure', 0):.0f} hPa")
         else:
@@ -591,11 +929,9 @@ class AirlineOperationsSystem:
     
     def _search_crew(self, crew_id: str):
         """Search for specific crew member"""
-        crew = self.flights_data.get('crew', [])
-        found_crew = [c for c in crew if c.get('crew_id') == crew_id]
+        member = self._crew_by_id.get(crew_id)
         
-        if found_crew:
-            member = found_crew[0]
+        if member:
             print(f"\nCrew Member: {crew_id}")
             print(f"  Name: {member.get('name')}")
             print(f"  Role: {member.get('role')}")
@@ -608,18 +944,14 @@ class AirlineOperationsSystem:
     
     def _search_route(self, route: str):
         """Search flights by route"""
-        flights = self.flights_data.get('flights', [])
-        route_flights = [f for f in flights if f.get('route') == route]
+        route_flights = self._flights_by_route.get(route)
         
         if route_flights:
             print(f"\nRoute: {route}")
             print(f"  Total Flights: {len(route_flights)}")
             
             # Categorize by status
-            status_counts = {}
-            for flight in route_flights:
-                status = flight.get('status')
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = Counter(flight.get('status') for flight in route_flights)
             
             print("  Status Breakdown:")
             for status, count in status_counts.items():
@@ -643,7 +975,9 @@ class AirlineOperationsSystem:
         
         if choice == '1':
             print("\nCurrent Configuration:")
-            print(json.dumps(self.config, indent=2))
+            if self._config_pretty is None:
+                self._config_pretty = _dumps_pretty(self.config).decode()
+            print(self._config_pretty)
         elif choice == '2':
             self._update_thresholds()
         elif choice == '3':
@@ -664,140 +998,150 @@ class AirlineOperationsSystem:
         print("2. Maintenance Thresholds")
         print("3. Operations Thresholds")
         print("4. Crew Thresholds")
+        print("5. All Thresholds")
         
-        choice = input("\nEnter choice (1-4): ").strip()
+        choice = input("\nEnter choice (1-5): ").strip()
         
-        if choice == '1':
-            self._update_weather_thresholds()
-        elif choice == '2':
-            self._update_maintenance_thresholds()
-        elif choice == '3':
-            self._update_operations_thresholds()
-        elif choice == '4':
-            self._update_crew_thresholds()
+        categories = {'1': 'weather', '2': 'maintenance', '3': 'operations', '4': 'crew'}
+        if choice == '5':
+            selected = list(THRESHOLD_FIELDS)
+        elif choice in categories:
+            selected = [categories[choice]]
         else:
             print("Invalid choice")
-    
-    def _update_weather_thresholds(self):
-        """Update weather thresholds"""
-        print("\nWeather Thresholds:")
-        current = self.config['thresholds']['weather']
-        
-        crosswind = input(f"Crosswind Max (knots) [{current['crosswind_max_knots']}]: ").strip()
-        if crosswind:
-            self.config['thresholds']['weather']['crosswind_max_knots'] = int(crosswind)
-        
-        visibility = input(f"Visibility Min (meters) [{current['visibility_min_meters']}]: ").strip()
-        if visibility:
-            self.config['thresholds']['weather']['visibility_min_meters'] = int(visibility)
-        
-        # Save configuration
-        with open('airline_config.json', 'w') as f:
-            json.dump(self.config, f, indent=2)
+            return
         
-        print("✓ Weather thresholds updated")
+        # Prompt every selected category first, then merge the edits in one batch
+        updates = {}
+        for category in selected:
+            updates[category] = self._prompt_category_thresholds(category)
+            print(f"✓ {category.title()} thresholds updated")
+        self._apply_thresholds(updates)
     
-    def _update_maintenance_thresholds(self):
-        """Update maintenance thresholds"""
-        print("\nMaintenance Thresholds:")
-        current = self.config['thresholds']['maintenance']
-        
-        vibration = input(f"Engine Vibration Threshold [{current['engine_vibration_threshold']}]: ").strip()
-        if vibration:
-            self.config['thresholds']['maintenance']['engine_vibration_threshold'] = float(vibration)
-        
-        cabin_temp = input(f"Cabin Temp Max (C) [{current['cabin_temp_max_celsius']}]: ").strip()
-        if cabin_temp:
-            self.config['thresholds']['maintenance']['cabin_temp_max_celsius'] = int(cabin_temp)
-        
-        # Save configuration
-        with open('airline_config.json', 'w') as f:
-            json.dump(self.config, f, indent=2)
-        
-        print("✓ Maintenance thresholds updated")
+    def _prompt_category_thresholds(self, category: str) -> Dict:
+        """Prompt for each threshold in a category and return only the values entered"""
+        print(f"\n{category.title()} Thresholds:")
+        current = self.config['thresholds'][category]
+        
+        values = {}
+        for key, prompt, cast in THRESHOLD_FIELDS[category]:
+            value = input(f"{prompt} [{current[key]}]: ").strip()
+            if value:
+                values[key] = cast(value)
+        return values
     
-    def _update_operations_thresholds(self):
-        """Update operations thresholds"""
-        print("\nOperations Thresholds:")
-        current = self.config['thresholds']['operations']
-        
-        runway = input(f"Runway Queue Max (minutes) [{current['runway_queue_max_minutes']}]: ").strip()
-        if runway:
-            self.config['thresholds']['operations']['runway_queue_max_minutes'] = int(runway)
-        
-        boarding = input(f"Boarding Max (minutes) [{current['boarding_max_minutes']}]: ").strip()
-        if boarding:
-            self.config['thresholds']['operations']['boarding_max_minutes'] = int(boarding)
-        
-        # Save configuration
-        with open('airline_config.json', 'w') as f:
-            json.dump(self.config, f, indent=2)
-        
-        print("✓ Operations thresholds updated")
-    
-    def _update_crew_thresholds(self):
-        """Update crew thresholds"""
-        print("\nCrew Thresholds:")
-        current = self.config['thresholds']['crew']
-        
-        duty = input(f"Max Duty Hours [{current['max_duty_hours']}]: ").strip()
-        if duty:
-            self.config['thresholds']['crew']['max_duty_hours'] = int(duty)
-        
-        rest = input(f"Min Rest Hours [{current['min_rest_hours']}]: ").strip()
-        if rest:
-            self.config['thresholds']['crew']['min_rest_hours'] = int(rest)
-        
-        # Save configuration
-        with open('airline_config.json', 'w') as f:
-            json.dump(self.config, f, indent=2)
-        
-        print("✓ Crew thresholds updated")
+    def _apply_thresholds(self, updates: Dict):
+        """Merge {category: {key: value}} threshold edits; saving is deferred until exit or backup"""
+        thresholds = self.config['thresholds']
+        changed = False
+        for category, values in updates.items():
+            if values:
+                thresholds[category].update(values)
+                changed = True
+        
+        if changed:
+            self._config_dirty = True
+            self._config_pretty = None
     
     def _backup_data(self):
         """Backup system data"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = f"output/backups/backup_{timestamp}.json"
+        self._flush_config_if_dirty()
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        backup_file = f"output/backups/backup_{timestamp}.jsonl"
         
-        backup_data = {
-            "config": self.config,
-            "flights_data": self.flights_data,
-            "timestamp": timestamp
-        }
+        # The header keeps key order and any non-list values; lists are filled from the record lines.
+        # It is encoded here so config edits made while the writer runs don't leak into the backup.
+        flights_data = self.flights_data
+        skeleton = {key: [] if isinstance(value, list) else value
+                    for key, value in flights_data.items()}
+        header = _dumps({"timestamp": timestamp, "config": self.config, "flights_data": skeleton}) + b'\n'
         
-        with open(backup_file, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        self._pending_writes.append(
+            self._io_pool.submit(self._stream_backup, backup_file, header, flights_data))
         
-        print(f"✓ Backup created: {backup_file}")
+        print(f"✓ Backup started: {backup_file}")
+    
+    def _stream_backup(self, backup_file: str, header: bytes, flights_data: Dict):
+        """Write the backup as JSON lines: a header, then one [key, record] line per record"""
+        # Streamed into a temporary file and renamed at the end, so restore never lists a partial backup
+        tmp = backup_file + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                w = f.write
+                w(header)
+                for key, records in flights_data.items():
+                    if isinstance(records, list):
+                        prefix = b'[' + _dumps(key) + b','
+                        for record in records:
+                            w(prefix + _dumps(record) + b']\n')
+                f.flush()
+                os.fsync(f.fileno())  # One sync for the whole backup
+            os.replace(tmp, backup_file)
+        except BaseException:
+            # Don't leave a partial temporary file behind (e.g. a record that won't serialize)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    
+    def _wait_for_writes(self):
+        """Block until queued backup writes finish, reporting any that failed"""
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:  # I/O or serialization errors; close() and atexit must not raise
+                print(f"✗ Backup failed: {str(e)}")
+    
+    def _read_backup(self, backup_file: str) -> Dict:
+        """Load a backup written either as JSON lines or as a single JSON document"""
+        with open(backup_file, 'rb') as f:
+            if not backup_file.endswith('.jsonl'):
+                return _loads(f.read())
+            
+            backup_data = _loads(f.readline())
+            flights_data = backup_data['flights_data']
+            for line in f:
+                key, record = _loads(line)
+                flights_data[key].append(record)
+        return backup_data
     
     def _restore_backup(self):
         """Restore system from backup"""
-        import glob
+        self._wait_for_writes()
+        try:
+            with os.scandir("output/backups") as entries:
+                # Newest first; the menu numbers index into this same list
+                backups = sorted(((entry.name, entry.path) for entry in entries
+                                  if entry.name.startswith("backup_")
+                                  and entry.name.endswith((".json", ".jsonl"))
+                                  and entry.is_file()), reverse=True)
+        except FileNotFoundError:
+            backups = []
         
-        backups = glob.glob("output/backups/backup_*.json")
         if not backups:
             print("No backups found")
             return
         
         print("\nAvailable Backups:")
-        for i, backup in enumerate(sorted(backups, reverse=True), 1):
-            print(f"{i}. {os.path.basename(backup)}")
+        for i, (name, _) in enumerate(backups, 1):
+            print(f"{i}. {name}")
         
         choice = input("\nSelect backup to restore (number): ").strip()
         
         try:
             index = int(choice) - 1
             if 0 <= index < len(backups):
-                with open(backups[index], 'r') as f:
-                    backup_data = json.load(f)
+                backup_data = self._read_backup(backups[index][1])
                 
                 # Restore configuration
                 self.config = backup_data['config']
-                with open('airline_config.json', 'w') as f:
-                    json.dump(self.config, f, indent=2)
+                self._save_config()
                 
                 # Restore flight data
                 self.flights_data = backup_data['flights_data']
+                self._build_indexes()
                 
                 print("✓ Backup restored successfully")
             else:
@@ -811,10 +1155,13 @@ class AirlineOperationsSystem:
         print("SYSTEM STATUS")
         print("-" * 80)
         
+        flights = self.flights_data.get('flights', [])
+        aircraft = {f['aircraft_id'] for f in flights if 'aircraft_id' in f}
+        
         print(f"Airline: {self.config['airline_name']}")
-        print(f"System Uptime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Flights in System: {len(self.flights_data.get('flights', []))}")
-        print(f"Aircraft in Fleet: {len(set(f.get('aircraft_id') for f in self.flights_data.get('flights', [])))}")
+        print(f"System Uptime: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Flights in System: {len(flights)}")
+        print(f"Aircraft in Fleet: {len(aircraft)}")
         print(f"Crew Members: {len(self.flights_data.get('crew', []))}")
         print(f"Pending Alerts: {self.alerts_queue.qsize()}")
         
@@ -826,6 +1173,7 @@ class AirlineOperationsSystem:
 
 def main():
     """Main entry point"""
+    system = None
     try:
         # Initialize system
         system = AirlineOperationsSystem()
@@ -854,6 +1202,9 @@ def main():
         print(f"\nSystem error: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        if system is not None:
+            system.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
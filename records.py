@@ -0,0 +1,31 @@
+"""
+Module for slotted records that read like the dicts they replaced
+"""
+
+
+class MappingRecord:
+    """Mixin giving a slotted record read-only dict access; every declared field is a key"""
+    __slots__ = ()
+    _fields = frozenset()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # dataclass(slots=True) rebuilds the class, so this runs again for the slotted version
+        cls._fields = frozenset(cls.__dict__.get('__slots__', ()))
+    
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __contains__(self, key):
+        return key in self._fields
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+    
+    def keys(self):
+        return self.__slots__
+    
+    def __iter__(self):
+        return iter(self.__slots__)
\ No newline at end of file
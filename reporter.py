@@ -1,10 +1,26 @@
 """
 Module for generating daily aviation reports
 """
+import heapq
+import io
 import json
 import os
-from datetime import datetime
-from tabulate import tabulate
+import time
+from collections import Counter
+from operator import itemgetter
+from types import SimpleNamespace
+
+try:
+    from .tables import grid_table
+except ImportError:  # Loaded as a top-level module rather than from the package
+    from tables import grid_table
+
+# Fixed report furniture, built once at import
+_EQ80 = "=" * 80 + "\n"
+_DASH80 = "-" * 80 + "\n"
+_SECTION_RULE = "=" * 40 + "\n\n"
+_TITLE = "DAILY AVIATION OPERATIONS REPORT\n".center(80)
+_END_TITLE = "END OF REPORT\n".center(80)
 
 class ReportGenerator:
     def __init__(self):
@@ -15,174 +31,203 @@ class ReportGenerator:
         """Generate daily aviation operations report"""
         report_path = os.path.join(self.reports_dir, f"aviation_report_{date_str}.txt")
         
-        with open(report_path, 'w') as f:
-            self._write_header(f, date_str)
-            self._write_executive_summary(f, flights_data, predictions)
-            self._write_delay_analysis(f, predictions.get('delays', []))
-            self._write_health_alerts(f, predictions.get('health_alerts', []))
-            self._write_load_analysis(f, predictions.get('load', []))
-            self._write_crew_schedule(f, predictions.get('crew_assignments', {}))
-            self._write_route_monitoring(f, predictions.get('route_alerts', []))
-            self._write_recommendations(f, predictions)
-            self._write_footer(f)
+        # Each section renders into its own buffer, in report order
+        stats = self._compute_stats(predictions)
+        sections = [
+            (self._write_header, (date_str,)),
+            (self._write_executive_summary, (flights_data, predictions, stats)),
+            (self._write_delay_analysis, (predictions.get('delays', []), stats)),
+            (self._write_health_alerts, (predictions.get('health_alerts', []), stats)),
+            (self._write_load_analysis, (predictions.get('load', []),)),
+            (self._write_crew_schedule, (predictions.get('crew_assignments', {}),)),
+            (self._write_route_monitoring, (predictions.get('route_alerts', []), stats)),
+            (self._write_recommendations, (stats,)),
+            (self._write_footer, ())
+        ]
+        
+        report = ''.join(map(self._render_section, sections))
+        
+        # The assembled report reaches the disk in one write
+        with open(report_path, 'wb') as f:
+            f.write(report.encode('utf-8'))
         
         return report_path
     
+    def _render_section(self, section):
+        """Render one (writer, args) section into a private buffer and return its text"""
+        writer, args = section
+        buf = io.StringIO()
+        writer(buf, *args)
+        return buf.getvalue()
+    
+    def _compute_stats(self, predictions):
+        """Aggregate each prediction list once for every section that reports on it"""
+        delays = predictions.get('delays', [])
+        delay_severity = Counter(map(itemgetter('severity'), delays))
+        # Count raw (template, value) reasons over one flat stream, then format each distinct one once
+        raw_reasons = Counter(reason for delay in delays for reason in delay['reasons'])
+        delay_reasons = Counter()
+        for (template, value), count in raw_reasons.items():
+            delay_reasons[template.format(value)] += count
+        
+        health_alerts = predictions.get('health_alerts', [])
+        crew_issues = predictions.get('crew_assignments', {}).get('issues', [])
+        route_alerts = predictions.get('route_alerts', [])
+        return SimpleNamespace(
+            delay_severity=delay_severity,
+            delay_reasons=delay_reasons,
+            top5_delays=heapq.nlargest(5, delays, key=itemgetter('predicted_delay_minutes')),
+            severe_delays=delay_severity['SEVERE'] + delay_severity['SIGNIFICANT'],
+            critical_health=[a for a in health_alerts if a['severity'] == 'CRITICAL'],
+            health_alert_types=Counter(map(itemgetter('alert_type'), health_alerts)),
+            critical_crew=any(i['severity'] == 'CRITICAL' for i in crew_issues),  # Stops at the first hit
+            overbooked_count=sum(1 for p in predictions.get('load', [])
+                                 if 'OVERBOOKING_RISK' in p['scenario_types']),
+            diversions=[a for a in route_alerts if a['alert_type'] == 'DIVERSION_RECOMMENDED']
+        )
+    
     def _write_header(self, file, date_str):
         """Write report header"""
-        file.write("="*80 + "\n")
-        file.write("DAILY AVIATION OPERATIONS REPORT\n".center(80))
-        file.write("="*80 + "\n")
-        file.write(f"Report Date: {date_str}\n")
-        file.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        file.write("-"*80 + "\n\n")
+        w = file.write
+        w(_EQ80)
+        w(_TITLE)
+        w(_EQ80)
+        w(f"Report Date: {date_str}\n")
+        w(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(_DASH80 + "\n")
     
-    def _write_executive_summary(self, file, flights_data, predictions):
+    def _write_executive_summary(self, file, flights_data, predictions, stats):
         """Write executive summary"""
-        file.write("EXECUTIVE SUMMARY\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("EXECUTIVE SUMMARY\n")
+        w(_SECTION_RULE)
         
         # Flight statistics
         total_flights = len(flights_data)
-        file.write(f"Total Flights Monitored: {total_flights}\n")
+        w(f"Total Flights Monitored: {total_flights}\n")
         
         # Delay statistics
         delays = predictions.get('delays', [])
         if delays:
             total_delays = len(delays)
-            avg_delay = sum(d['predicted_delay_minutes'] for d in delays) / total_delays
-            file.write(f"Flights with Predicted Delays: {total_delays} ({total_delays/total_flights*100:.1f}%)\n")
-            file.write(f"Average Predicted Delay: {avg_delay:.1f} minutes\n")
+            avg_delay = sum(map(itemgetter('predicted_delay_minutes'), delays)) / total_delays
+            w(f"Flights with Predicted Delays: {total_delays} ({total_delays/total_flights*100:.1f}%)\n")
+            w(f"Average Predicted Delay: {avg_delay:.1f} minutes\n")
         else:
-            file.write("Flights with Predicted Delays: 0\n")
+            w("Flights with Predicted Delays: 0\n")
         
         # Health alerts
-        health_alerts = predictions.get('health_alerts', [])
-        critical_alerts = [a for a in health_alerts if a['severity'] == 'CRITICAL']
-        file.write(f"Critical Health Alerts: {len(critical_alerts)}\n")
+        w(f"Critical Health Alerts: {len(stats.critical_health)}\n")
         
         # Crew issues
         crew_data = predictions.get('crew_assignments', {})
         crew_issues = len(crew_data.get('issues', []))
-        file.write(f"Crew Scheduling Issues: {crew_issues}\n")
+        w(f"Crew Scheduling Issues: {crew_issues}\n")
         
         # Load statistics
         load_predictions = predictions.get('load', [])
         if load_predictions:
-            avg_load = sum(p['predicted_load_factor'] for p in load_predictions) / len(load_predictions)
-            file.write(f"Average Predicted Load Factor: {avg_load:.1%}\n")
+            avg_load = sum(map(itemgetter('predicted_load_factor'), load_predictions)) / len(load_predictions)
+            w(f"Average Predicted Load Factor: {avg_load:.1%}\n")
         
-        file.write("\n")
+        w("\n")
     
-    def _write_delay_analysis(self, file, delay_predictions):
+    def _write_delay_analysis(self, file, delay_predictions, stats):
         """Write delay analysis section"""
-        file.write("DELAY PREDICTION ANALYSIS\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("DELAY PREDICTION ANALYSIS\n")
+        w(_SECTION_RULE)
         
         if not delay_predictions:
-            file.write("No delays predicted for today.\n\n")
+            w("No delays predicted for today.\n\n")
             return
         
-        # Categorize by severity
-        severity_counts = {}
-        for delay in delay_predictions:
-            severity = delay['severity']
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        file.write("Delay Severity Distribution:\n")
+        w("Delay Severity Distribution:\n")
         for severity in ['SEVERE', 'SIGNIFICANT', 'MODERATE', 'MINOR']:
-            count = severity_counts.get(severity, 0)
+            count = stats.delay_severity[severity]
             if count > 0:
-                file.write(f"  {severity}: {count} flights\n")
+                w(f"  {severity}: {count} flights\n")
         
         # Top delays
-        file.write("\nTop 5 Delays:\n")
-        sorted_delays = sorted(delay_predictions, key=lambda x: x['predicted_delay_minutes'], reverse=True)[:5]
-        
+        w("\nTop 5 Delays:\n")
         table_data = []
-        for delay in sorted_delays:
+        for delay in stats.top5_delays:
             table_data.append([
                 delay['flight_id'],
                 f"{delay['predicted_delay_minutes']} min",
                 delay['severity'],
-                ', '.join(delay['reasons'][:2])
+                ', '.join(template.format(value) for template, value in delay['reasons'][:2])
             ])
         
         headers = ["Flight", "Delay", "Severity", "Primary Reasons"]
-        file.write(tabulate(table_data, headers=headers, tablefmt="grid"))
-        file.write("\n\n")
+        w(grid_table(table_data, headers))
+        w("\n\n")
         
         # Delay reasons analysis
-        file.write("Common Delay Reasons:\n")
-        reasons = {}
-        for delay in delay_predictions:
-            for reason in delay['reasons']:
-                reasons[reason] = reasons.get(reason, 0) + 1
-        
-        for reason, count in sorted(reasons.items(), key=lambda x: x[1], reverse=True)[:5]:
-            file.write(f"  {reason}: {count} occurrences\n")
+        w("Common Delay Reasons:\n")
+        for reason, count in stats.delay_reasons.most_common(5):
+            w(f"  {reason}: {count} occurrences\n")
         
-        file.write("\n")
+        w("\n")
     
-    def _write_health_alerts(self, file, health_alerts):
+    def _write_health_alerts(self, file, health_alerts, stats):
         """Write health alerts section"""
-        file.write("AIRCRAFT HEALTH MONITORING\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("AIRCRAFT HEALTH MONITORING\n")
+        w(_SECTION_RULE)
         
         if not health_alerts:
-            file.write("No health alerts generated.\n\n")
+            w("No health alerts generated.\n\n")
             return
         
         # Critical alerts
-        critical_alerts = [a for a in health_alerts if a['severity'] == 'CRITICAL']
+        critical_alerts = stats.critical_health
         if critical_alerts:
-            file.write("🔴 CRITICAL ALERTS:\n")
-            for alert in critical_alerts:
-                file.write(f"  Flight {alert['flight_id']} - {alert['aircraft_id']}\n")
-                file.write(f"    Alert: {alert['alert_type']}\n")
-                file.write(f"    Message: {alert['message']}\n")
-                file.write(f"    Time: {alert['timestamp']}\n\n")
+            w("🔴 CRITICAL ALERTS:\n")
+            w(''.join(
+                f"  Flight {alert['flight_id']} - {alert['aircraft_id']}\n"
+                f"    Alert: {alert['alert_type']}\n"
+                f"    Message: {alert['message']}\n"
+                f"    Time: {alert['timestamp']}\n\n"
+                for alert in critical_alerts
+            ))
         
         # Alert statistics
-        file.write("Alert Statistics:\n")
-        alert_types = {}
-        for alert in health_alerts:
-            alert_type = alert['alert_type']
-            alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
-        
-        for alert_type, count in sorted(alert_types.items(), key=lambda x: x[1], reverse=True):
-            file.write(f"  {alert_type}: {count}\n")
+        w("Alert Statistics:\n")
+        w(''.join(f"  {alert_type}: {count}\n" for alert_type, count in stats.health_alert_types.most_common()))
         
-        file.write("\n")
+        w("\n")
     
     def _write_load_analysis(self, file, load_predictions):
         """Write passenger load analysis"""
-        file.write("PASSENGER LOAD PREDICTIONS\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("PASSENGER LOAD PREDICTIONS\n")
+        w(_SECTION_RULE)
         
         if not load_predictions:
-            file.write("No load predictions available.\n\n")
+            w("No load predictions available.\n\n")
             return
         
-        # Statistics
-        total_capacity = sum(p['capacity'] for p in load_predictions)
-        total_passengers = sum(p['predicted_passengers'] for p in load_predictions)
+        # Statistics, each reduced in C over one extracted column
+        total_capacity = sum(map(itemgetter('capacity'), load_predictions))
+        total_passengers = sum(map(itemgetter('predicted_passengers'), load_predictions))
+        load_factors = list(map(itemgetter('predicted_load_factor'), load_predictions))
         avg_load = total_passengers / total_capacity if total_capacity > 0 else 0
         
-        file.write(f"Total Predicted Passengers: {total_passengers:,}\n")
-        file.write(f"Total Available Capacity: {total_capacity:,}\n")
-        file.write(f"System-wide Load Factor: {avg_load:.1%}\n\n")
+        w(f"Total Predicted Passengers: {total_passengers:,}\n")
+        w(f"Total Available Capacity: {total_capacity:,}\n")
+        w(f"System-wide Load Factor: {avg_load:.1%}\n\n")
         
         # Flight categories
-        full_flights = [p for p in load_predictions if p['predicted_load_factor'] > 0.9]
-        low_flights = [p for p in load_predictions if p['predicted_load_factor'] < 0.4]
+        full_flights = sum(1 for lf in load_factors if lf > 0.9)
+        low_flights = sum(1 for lf in load_factors if lf < 0.4)
         
-        file.write(f"Flights >90% Full: {len(full_flights)}\n")
-        file.write(f"Flights <40% Load: {len(low_flights)}\n\n")
+        w(f"Flights >90% Full: {full_flights}\n")
+        w(f"Flights <40% Load: {low_flights}\n\n")
         
         # Top flights by load
-        file.write("Top 5 Flights by Load Factor:\n")
-        sorted_loads = sorted(load_predictions, key=lambda x: x['predicted_load_factor'], reverse=True)[:5]
+        w("Top 5 Flights by Load Factor:\n")
+        sorted_loads = heapq.nlargest(5, load_predictions, key=itemgetter('predicted_load_factor'))
         
         table_data = []
         for load in sorted_loads:
@@ -195,131 +240,127 @@ class ReportGenerator:
             ])
         
         headers = ["Flight", "Passengers", "Capacity", "Load Factor", "Demand Level"]
-        file.write(tabulate(table_data, headers=headers, tablefmt="grid"))
-        file.write("\n\n")
+        w(grid_table(table_data, headers, '<>><<'))  # Counts are right-aligned
+        w("\n\n")
     
     def _write_crew_schedule(self, file, crew_data):
         """Write crew scheduling section"""
-        file.write("CREW SCHEDULING\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("CREW SCHEDULING\n")
+        w(_SECTION_RULE)
         
         assignments = crew_data.get('assignments', [])
         issues = crew_data.get('issues', [])
         summary = crew_data.get('summary', {})
         
-        file.write(f"Flights Scheduled: {summary.get('total_flights_scheduled', 0)}\n")
-        file.write(f"Crew Members Utilized: {summary.get('total_crew_utilized', 0)}\n")
-        file.write(f"Average Flights per Crew: {summary.get('avg_flights_per_crew', 0):.1f}\n\n")
+        w(f"Flights Scheduled: {summary.get('total_flights_scheduled', 0)}\n")
+        w(f"Crew Members Utilized: {summary.get('total_crew_utilized', 0)}\n")
+        w(f"Average Flights per Crew: {summary.get('avg_flights_per_crew', 0):.1f}\n\n")
         
         # Issues
         if issues:
-            file.write("SCHEDULING ISSUES:\n")
+            w("SCHEDULING ISSUES:\n")
             for issue in issues:
-                file.write(f"  Type: {issue['type']}\n")
-                file.write(f"  Severity: {issue['severity']}\n")
+                w(f"  Type: {issue['type']}\n")
+                w(f"  Severity: {issue['severity']}\n")
                 if 'flight_id' in issue:
-                    file.write(f"  Flight: {issue['flight_id']}\n")
+                    w(f"  Flight: {issue['flight_id']}\n")
                 if 'crew_id' in issue:
-                    file.write(f"  Crew: {issue['crew_id']}\n")
-                file.write("\n")
+                    w(f"  Crew: {issue['crew_id']}\n")
+                w("\n")
         else:
-            file.write("No scheduling issues detected.\n\n")
+            w("No scheduling issues detected.\n\n")
         
         # Sample assignments
         if assignments:
-            file.write("Sample Crew Assignments (First 5):\n")
+            w("Sample Crew Assignments (First 5):\n")
             for assignment in assignments[:5]:
-                file.write(f"  Flight {assignment['flight_id']}:\n")
-                file.write(f"    Captain: {assignment.get('captain', 'Not assigned')}\n")
-                file.write(f"    First Officer: {assignment.get('first_officer', 'Not assigned')}\n")
-                file.write(f"    Attendants: {len(assignment.get('attendants', []))}\n\n")
+                w(f"  Flight {assignment['flight_id']}:\n")
+                w(f"    Captain: {assignment.get('captain', 'Not assigned')}\n")
+                w(f"    First Officer: {assignment.get('first_officer', 'Not assigned')}\n")
+                w(f"    Attendants: {len(assignment.get('attendants', []))}\n\n")
         
-        file.write("\n")
+        w("\n")
     
-    def _write_route_monitoring(self, file, route_alerts):
+    def _write_route_monitoring(self, file, route_alerts, stats):
         """Write route monitoring section"""
-        file.write("ROUTE MONITORING & DIVERSION RECOMMENDATIONS\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("ROUTE MONITORING & DIVERSION RECOMMENDATIONS\n")
+        w(_SECTION_RULE)
         
         if not route_alerts:
-            file.write("No route alerts generated.\n\n")
+            w("No route alerts generated.\n\n")
             return
         
         # Diversion recommendations
-        diversions = [a for a in route_alerts if a['alert_type'] == 'DIVERSION_RECOMMENDED']
+        diversions = stats.diversions
         if diversions:
-            file.write("DIVERSION RECOMMENDATIONS:\n")
-            for alert in diversions:
-                file.write(f"  Flight: {alert['flight_id']}\n")
-                file.write(f"  Current Destination: {alert['current_destination']}\n")
-                file.write(f"  Suggested Diversion: {alert['suggested_diversion']}\n")
-                file.write(f"  Additional Time: {alert['additional_flight_time_minutes']} minutes\n")
-                file.write(f"  Reason: {alert['message']}\n\n")
+            w("DIVERSION RECOMMENDATIONS:\n")
+            w(''.join(
+                f"  Flight: {alert['flight_id']}\n"
+                f"  Current Destination: {alert['current_destination']}\n"
+                f"  Suggested Diversion: {alert['suggested_diversion']}\n"
+                f"  Additional Time: {alert['additional_flight_time_minutes']} minutes\n"
+                f"  Reason: {alert['message']}\n\n"
+                for alert in diversions
+            ))
         
         # Weather alerts
         weather_alerts = [a for a in route_alerts if a['alert_type'] != 'DIVERSION_RECOMMENDED']
         if weather_alerts:
-            file.write("WEATHER ALERTS:\n")
+            w("WEATHER ALERTS:\n")
             critical_weather = [a for a in weather_alerts if a['severity'] == 'CRITICAL']
             
-            for alert in critical_weather:
-                file.write(f"  Flight: {alert['flight_id']}\n")
-                file.write(f"  Alert Type: {alert['alert_type']}\n")
-                file.write(f"  Location: {alert.get('location', 'Unknown')}\n")
-                file.write(f"  Message: {alert['message']}\n\n")
-        
-        file.write("\n")
+            w(''.join(
+                f"  Flight: {alert['flight_id']}\n"
+                f"  Alert Type: {alert['alert_type']}\n"
+                f"  Location: {alert.get('location', 'Unknown')}\n"
+                f"  Message: {alert['message']}\n\n"
+                for alert in critical_weather
+            ))
+        
+        w("\n")
     
-    def _write_recommendations(self, file, predictions):
+    def _write_recommendations(self, file, stats):
         """Write recommendations section"""
-        file.write("OPERATIONAL RECOMMENDATIONS\n")
-        file.write("="*40 + "\n\n")
+        w = file.write
+        w("OPERATIONAL RECOMMENDATIONS\n")
+        w(_SECTION_RULE)
         
         recommendations = []
         
         # Check for critical issues
-        health_alerts = predictions.get('health_alerts', [])
-        critical_health = [a for a in health_alerts if a['severity'] == 'CRITICAL']
-        if critical_health:
+        if stats.critical_health:
             recommendations.append("Schedule immediate maintenance for aircraft with critical health alerts.")
         
         # Check for crew shortages
-        crew_data = predictions.get('crew_assignments', {})
-        crew_issues = crew_data.get('issues', [])
-        critical_crew = [i for i in crew_issues if i['severity'] == 'CRITICAL']
-        if critical_crew:
+        if stats.critical_crew:
             recommendations.append("Address critical crew shortages immediately.")
         
         # Check for major delays
-        delays = predictions.get('delays', [])
-        severe_delays = [d for d in delays if d['severity'] in ['SEVERE', 'SIGNIFICANT']]
-        if severe_delays:
-            recommendations.append(f"Prepare passenger services for {len(severe_delays)} flights with significant delays.")
+        if stats.severe_delays:
+            recommendations.append(f"Prepare passenger services for {stats.severe_delays} flights with significant delays.")
         
         # Check for overbooking
-        load_predictions = predictions.get('load', [])
-        overbooked = sum(1 for p in load_predictions 
-                        if any(s['type'] == 'OVERBOOKING_RISK' for s in p['scenarios']))
-        if overbooked:
-            recommendations.append(f"Prepare overbooking protocols for {overbooked} flights.")
+        if stats.overbooked_count:
+            recommendations.append(f"Prepare overbooking protocols for {stats.overbooked_count} flights.")
         
         # Check for diversions
-        route_alerts = predictions.get('route_alerts', [])
-        diversions = [a for a in route_alerts if a['alert_type'] == 'DIVERSION_RECOMMENDED']
-        if diversions:
-            recommendations.append(f"Coordinate with {len(diversions)} alternate airports for potential diversions.")
+        if stats.diversions:
+            recommendations.append(f"Coordinate with {len(stats.diversions)} alternate airports for potential diversions.")
         
         # Write recommendations
         if recommendations:
             for i, rec in enumerate(recommendations, 1):
-                file.write(f"{i}. {rec}\n")
+                w(f"{i}. {rec}\n")
         else:
-            file.write("No critical recommendations at this time.\n")
+            w("No critical recommendations at this time.\n")
         
-        file.write("\n")
+        w("\n")
     
     def _write_footer(self, file):
         """Write report footer"""
-        file.write("="*80 + "\n")
-        file.write("END OF REPORT\n".center(80))
-        file.write("="*80 + "\n")
\ No newline at end of file
+        w = file.write
+        w(_EQ80)
+        w(_END_TITLE)
+        w(_EQ80)
\ No newline at end of file
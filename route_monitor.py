@@ -1,455 +1,368 @@
 """
 Module for monitoring flight routes and suggesting diversions
 """
+import itertools
 import random
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Optional
 
-class RouteMonitor:
-    def __init__(self):
-        self.airports = {
-            'DEL': {'name': 'Delhi', 'alt_runways': ['AMD', 'ATQ']},
-            'BOM': {'name': 'Mumbai', 'alt_runways': ['GOI', 'PNQ']},
-            'BLR': {'name': 'Bangalore', 'alt_runways': ['MAA', 'HYD']},
-            'MAA': {'name': 'Chennai', 'alt_runways': ['BLR', 'HYD']},
-            'HYD': {'name': 'Hyderabad', 'alt_runways': ['BLR', 'GOI']},
-            'CCU': {'name': 'Kolkata', 'alt_runways': ['GAU', 'PAT']},
-            'DXB': {'name': 'Dubai', 'alt_runways': ['AUH', 'DOH']},
-            'LHR': {'name': 'London', 'alt_runways': ['LGW', 'MAN']},
-            'JFK': {'name': 'New York', 'alt_runways': ['EWR', 'BOS']},
-            'SIN': {'name': 'Singapore', 'alt_runways': ['KUL', 'CGK']}
-        }
-        
-        self.weather_risks = {}
-    
-    def monitor_routes(self, flights_data):
-        """Monitor routes for all flights"""
-        alerts = []
-        
-        for flight in flights_data:
-            route_alerts = self._monitor_single_route(flight)
-            alerts.extend(route_alerts)
-        
-        return alerts
-    
-    def _monitor_single_route(self, flight):
-        """Monitor route for a single flight"""
-        flight_id = flight['flight_id']
-        alerts = []
-        
-        # Get route info
-        origin = None
-        destination = None
-        
-        for log in flight['logs']:
-            if 'origin' in log and 'destination' in log:
-                origin = log['origin']
-                destination = log['destination']
-                break
-        
-        if not origin or not destination:
-            return alerts
-        
-        # Check weather enroute
-        weather_alerts = self._check_route_weather(flight, origin, destination)
-        alerts.extend(weather_alerts)
-        
-        # Check destination weather
-        dest_alerts = self._check_destination_weather(flight, destination)
-        alerts.extend(dest_alerts)
-        
-        # Check for diversion needs
-        if weather_alerts or dest_alerts:
-            diversion = self._suggest_diversion(origin, destination, flight_id)
-            if diversion:
-                alerts.append(diversion)
-        
-        return alerts
+try:
+    from .records import MappingRecord
+except ImportError:  # Loaded as a top-level module rather than from the package
+    from records import MappingRecord
+
+ENROUTE_CROSSWIND_KNOTS = 40  # Crosswind above this raises HIGH_CROSSWIND_ENROUTE
+DEST_VISIBILITY_MIN_METERS = 1500
+DEST_WIND_MAX_KNOTS = 30
+
+# Enroute weather conditions, packed into one bitmask per weather log
+TURBULENCE_BIT = 1
+THUNDERSTORM_BIT = 2
+CROSSWIND_BIT = 4
+
+# Static fields of every alert, keyed by alert ID prefix
+ALERT_TEMPLATES = {
+    'WX-TURB': {
+        'alert_type': 'SEVERE_TURBULENCE_ENROUTE',
+        'severity': 'HIGH',
+        'location': 'Enroute',
+        'metric': 'turbulence',
+        'value': 'severe',
+        'message': 'Severe turbulence detected along route',
+        'recommendation': 'Consider altitude change or route deviation'
+    },
+    'WX-TSTM': {
+        'alert_type': 'THUNDERSTORM_ENROUTE',
+        'severity': 'HIGH',
+        'location': 'Enroute',
+        'metric': 'thunderstorm',
+        'value': True,
+        'message': 'Thunderstorm activity along route',
+        'recommendation': 'Request weather deviation clearance'
+    },
+    'WX-WIND': {
+        'alert_type': 'HIGH_CROSSWIND_ENROUTE',
+        'severity': 'MEDIUM',
+        'location': 'Enroute',
+        'metric': 'crosswind',
+        'threshold': ENROUTE_CROSSWIND_KNOTS,
+        'recommendation': 'Be prepared for challenging conditions'
+    },
+    'WX-VIS': {
+        'alert_type': 'LOW_VISIBILITY_AT_DESTINATION',
+        'severity': 'HIGH',
+        'metric': 'visibility',
+        'threshold': DEST_VISIBILITY_MIN_METERS,
+        'recommendation': 'Consider holding or diversion'
+    },
+    'WX-DEST-TSTM': {
+        'alert_type': 'THUNDERSTORM_AT_DESTINATION',
+        'severity': 'HIGH',
+        'metric': 'thunderstorm',
+        'value': True,
+        'recommendation': 'Hold or divert to alternate'
+    },
+    'WX-DEST-WIND': {
+        'alert_type': 'HIGH_WINDS_AT_DESTINATION',
+        'severity': 'MEDIUM',
+        'metric': 'wind_speed',
+        'threshold': DEST_WIND_MAX_KNOTS,
+        'recommendation': 'Be prepared for challenging landing'
+    },
+    'DIV': {
+        'alert_type': 'DIVERSION_RECOMMENDED',
+        'severity': 'HIGH'
+    }
+}
+
+
+@dataclass(slots=True)
+class RouteAlert(MappingRecord):
+    """Fixed-field route alert that also reads like the old alert dicts"""
+    alert_id: str
+    flight_id: str
+    timestamp: str
+    alert_type: str
+    severity: str
+    location: Optional[str] = None
+    metric: Optional[str] = None
+    value: Any = None
+    threshold: Optional[float] = None
+    current_destination: Optional[str] = None
+    suggested_diversion: Optional[str] = None
+    additional_flight_time_minutes: Optional[int] = None
+    message: Optional[str] = None
+    recommendation: Optional[str] = None
+
+_ROW_FIELDS = RouteAlert.__slots__[3:]  # Everything after alert_id, flight_id and timestamp
+
+
+def _alert_row(prefix, **fields):
+    """An alert type's fields after the per-alert three, in RouteAlert order for positional construction"""
+    values = {**ALERT_TEMPLATES[prefix], **fields}
+    return tuple(values.get(name) for name in _ROW_FIELDS)
+
+# Rows for alert types with no per-alert values beyond the ID, flight and timestamp
+ALERT_ROWS = {prefix: _alert_row(prefix) for prefix in ALERT_TEMPLATES}
+
+
+def _flatten_routes(flights_data):
+    """Each flight's route, plus its weather readings flattened into columns with per-flight offsets"""
+    routes = []
+    weather_metrics = []
+    turbulence = []
+    thunderstorm = []
+    crosswind = []
+    offsets = [0]
     
-    def _check_route_weather(self, flight, origin, destination):
-        """Check weather along the route"""
-        alerts = []
-        flight_id = flight['flight_id']
-        
-        # Get weather logs for this flight
-        weather_logs = [log for log in flight['logs'] if log['log_type'] == 'weather_data']
-        
-        for log in weather_logs:
-            metrics = log['metrics']
-            
-            # Severe turbulence
-            if metrics.get('turbulence') == 'severe':
-                alert = {
-                    'alert_id': f"WX-TURB-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'SEVERE_TURBULENCE_ENROUTE',
-                    'severity': 'HIGH',
-                    'location': 'Enroute',
-                    'metric': 'turbulence',
-                    'value': 'severe',
-                    'message': 'Severe turbulence detected along route',
-                    'recommendation': 'Consider altitude change or route deviation'
-                }
-                alerts.append(alert)
-            
-            # Thunderstorms
-            if metrics.get('thunderstorm', False):
-                alert = {
-                    'alert_id': f"WX-TSTM-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'THUNDERSTORM_ENROUTE',
-                    'severity': 'HIGH',
-                    'location': 'Enroute',
-                    'metric': 'thunderstorm',
-                    'value': True,
-                    'message': 'Thunderstorm activity along route',
-                    'recommendation': 'Request weather deviation clearance'
-                }
-                alerts.append(alert)
-            
-            # High crosswind
-            if metrics.get('crosswind', 0) > 40:
-                alert = {
-                    'alert_id': f"WX-WIND-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'HIGH_CROSSWIND_ENROUTE',
-                    'severity': 'MEDIUM',
-                    'location': 'Enroute',
-                    'metric': 'crosswind',
-                    'value': metrics['crosswind'],
-                    'threshold': 40,
-                    'message': f'High crosswind ({metrics["crosswind"]:.1f} knots) along route',
-                    'recommendation': 'Be prepared for challenging conditions'
-                }
-                alerts.append(alert)
-        
-        return alerts
+    for flight in flights_data:
+        logs = flight['logs']
+        # The first log carrying a route; processed logs always do, so this usually stops at the first
+        route_log = next((log for log in logs if 'origin' in log and 'destination' in log), None)
+        if route_log is None:
+            routes.append((None, None))
+        else:
+            routes.append((route_log['origin'], route_log['destination']))
+        
+        for log in logs:
+            if log['log_type'] == 'weather_data':
+                metrics = log['metrics']
+                get_metric = metrics.get
+                weather_metrics.append(metrics)
+                turbulence.append(get_metric('turbulence'))
+                thunderstorm.append(get_metric('thunderstorm', False))
+                crosswind.append(get_metric('crosswind', 0))
+        offsets.append(len(weather_metrics))
     
-    def _check_destination_weather(self, flight, destination):
-        """Check destination weather conditions"""
-        alerts = []
-        flight_id = flight['flight_id']
-        
-        # Simulate destination weather (in real system, this would be from API)
-        dest_weather = self._simulate_destination_weather(destination)
-        
-        # Low visibility
-        if dest_weather['visibility'] < 1500:
-            alert = {
-                'alert_id': f"WX-VIS-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'LOW_VISIBILITY_AT_DESTINATION',
-                'severity': 'HIGH',
-                'location': destination,
-                'metric': 'visibility',
-                'value': dest_weather['visibility'],
-                'threshold': 1500,
-                'message': f'Low visibility at {destination}: {dest_weather["visibility"]:.0f} meters',
-                'recommendation': 'Consider holding or diversion'
-            }
-            alerts.append(alert)
-        
-        # Thunderstorm at destination
-        if dest_weather['thunderstorm']:
-            alert = {
-                'alert_id': f"WX-DEST-TSTM-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'THUNDERSTORM_AT_DESTINATION',
-                'severity': 'HIGH',
-                'location': destination,
-                'metric': 'thunderstorm',
-                'value': True,
-                'message': f'Thunderstorm activity at {destination}',
-                'recommendation': 'Hold or divert to alternate'
-            }
-            alerts.append(alert)
-        
-        # High winds at destination
-        if dest_weather['wind_speed'] > 30:
-            alert = {
-                'alert_id': f"WX-DEST-WIND-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'HIGH_WINDS_AT_DESTINATION',
-                'severity': 'MEDIUM',
-                'location': destination,
-                'metric': 'wind_speed',
-                'value': dest_weather['wind_speed'],
-                'threshold': 30,
-                'message': f'High winds at {destination}: {dest_weather["wind_speed"]:.1f} knots',
-                'recommendation': 'Be prepared for challenging landing'
-            }
-            alerts.append(alert)
-        
-        return alerts
-    
-    def _suggest_diversion(self, origin, destination, flight_id):
-        """Suggest diversion airport if needed"""
-        if destination not in self.airports:
-            return None
-        
-        # Check if diversion is needed (simulated logic)
-        need_diversion = random.random() < 0.2  # 20% chance for demo
-        
-        if need_diversion and self.airports[destination]['alt_runways']:
-            alt_airport = random.choice(self.airports[destination]['alt_runways'])
-            
-            # Calculate additional time (simplified)
-            additional_time = random.randint(30, 120)  # minutes
-            
-            return {
-                'alert_id': f"DIV-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'DIVERSION_RECOMMENDED',
-                'severity': 'HIGH',
-                'current_destination': destination,
-                'suggested_diversion': alt_airport,
-                'additional_flight_time_minutes': additional_time,
-                'message': f'Consider diverting to {alt_airport} due to weather at {destination}',
-                'recommendation': f'Divert to {alt_airport}, estimated additional time: {additional_time} minutes'
-            }
-        
-        return None
-    """
-Module for monitoring flight routes and suggesting diversions
-"""
-import random
-from datetime import datetime, timedelta
+    return routes, weather_metrics, (turbulence, thunderstorm, crosswind), offsets
+
+
+def _weather_kernel(turbulence, thunderstorm, crosswind):
+    """Enroute condition mask for every weather reading; 0 where none trips"""
+    return [
+        (turb == 'severe') * TURBULENCE_BIT
+        | bool(storm) * THUNDERSTORM_BIT
+        | (wind > ENROUTE_CROSSWIND_KNOTS) * CROSSWIND_BIT
+        for turb, storm, wind in zip(turbulence, thunderstorm, crosswind)
+    ]
+
+
+# Network airports, built once at import and shared read-only by every monitor
+AIRPORTS = MappingProxyType({
+    'DEL': MappingProxyType({'name': 'Delhi', 'alt_runways': ('AMD', 'ATQ')}),
+    'BOM': MappingProxyType({'name': 'Mumbai', 'alt_runways': ('GOI', 'PNQ')}),
+    'BLR': MappingProxyType({'name': 'Bangalore', 'alt_runways': ('MAA', 'HYD')}),
+    'MAA': MappingProxyType({'name': 'Chennai', 'alt_runways': ('BLR', 'HYD')}),
+    'HYD': MappingProxyType({'name': 'Hyderabad', 'alt_runways': ('BLR', 'GOI')}),
+    'CCU': MappingProxyType({'name': 'Kolkata', 'alt_runways': ('GAU', 'PAT')}),
+    'DXB': MappingProxyType({'name': 'Dubai', 'alt_runways': ('AUH', 'DOH')}),
+    'LHR': MappingProxyType({'name': 'London', 'alt_runways': ('LGW', 'MAN')}),
+    'JFK': MappingProxyType({'name': 'New York', 'alt_runways': ('EWR', 'BOS')}),
+    'SIN': MappingProxyType({'name': 'Singapore', 'alt_runways': ('KUL', 'CGK')})
+})
+
+# Destination -> alternate airports, only for airports that have any
+ALT_RUNWAYS = MappingProxyType({
+    code: airport['alt_runways'] for code, airport in AIRPORTS.items() if airport['alt_runways']
+})
+
+# Destinations a diversion can be suggested for; one set probe gates the whole suggestion
+DIVERTIBLE_DESTINATIONS = frozenset(ALT_RUNWAYS)
+
+# A diversion reuses its roll (uniform over 0-19) to pick the alternate, which is only
+# uniform when the number of alternates divides 20; every network airport lists two
+assert all(20 % len(alternates) == 0 for alternates in ALT_RUNWAYS.values())
+
 
 class RouteMonitor:
     def __init__(self):
-        self.airports = {
-            'DEL': {'name': 'Delhi', 'alt_runways': ['AMD', 'ATQ']},
-            'BOM': {'name': 'Mumbai', 'alt_runways': ['GOI', 'PNQ']},
-            'BLR': {'name': 'Bangalore', 'alt_runways': ['MAA', 'HYD']},
-            'MAA': {'name': 'Chennai', 'alt_runways': ['BLR', 'HYD']},
-            'HYD': {'name': 'Hyderabad', 'alt_runways': ['BLR', 'GOI']},
-            'CCU': {'name': 'Kolkata', 'alt_runways': ['GAU', 'PAT']},
-            'DXB': {'name': 'Dubai', 'alt_runways': ['AUH', 'DOH']},
-            'LHR': {'name': 'London', 'alt_runways': ['LGW', 'MAN']},
-            'JFK': {'name': 'New York', 'alt_runways': ['EWR', 'BOS']},
-            'SIN': {'name': 'Singapore', 'alt_runways': ['KUL', 'CGK']}
-        }
+        self.airports = AIRPORTS
+        self.alt_runways = ALT_RUNWAYS
         
         self.weather_risks = {}
+        self.alert_sequence = itertools.count(1)
+        self._rng = random.Random()
     
     def monitor_routes(self, flights_data):
         """Monitor routes for all flights"""
-        alerts = []
-        
-        for flight in flights_data:
-            route_alerts = self._monitor_single_route(flight)
-            alerts.extend(route_alerts)
-        
-        return alerts
+        return list(self.iter_route_alerts(flights_data))
     
-    def _monitor_single_route(self, flight):
-        """Monitor route for a single flight"""
+    def iter_route_alerts(self, flights_data):
+        """Yield route alerts flight by flight as each flight is checked"""
+        # One clock reading per batch; alert IDs are disambiguated by a counter
+        now = datetime.now()
+        timestamp = now.isoformat()
+        time_tag = now.strftime('%H%M%S')
+        # Full "<prefix>-<HHMMSS>-" ID stems per alert type, so each alert only appends its number
+        id_stems = {prefix: f"{prefix}-{time_tag}-" for prefix in ALERT_TEMPLATES}
+        destination_outcomes = {}  # Destination -> its weather alerts, shared by every flight in the batch
+        
+        # Weather readings go into flat columns; the kernel masks them all at once
+        routes, weather_metrics, columns, offsets = _flatten_routes(flights_data)
+        masks = _weather_kernel(*columns)
+        
+        # Per flight: route plus (mask, metrics) of only the readings that tripped a condition
+        scans = (
+            (origin, destination, [
+                (masks[j], weather_metrics[j]) for j in range(offsets[i], offsets[i + 1]) if masks[j]
+            ])
+            for i, (origin, destination) in enumerate(routes)
+        )
+        
+        # Diversion dice for the whole batch in two calls; a flight only reads its pair if it has alerts
+        diversion_draws = zip(
+            self._rng.choices(range(100), k=len(flights_data)),
+            self._rng.choices(range(30, 121), k=len(flights_data))  # Additional minutes
+        )
+        
+        # IDs and random draws follow flight order
+        for flight, scan, diversion_draw in zip(flights_data, scans, diversion_draws):
+            yield from self._monitor_single_route(
+                flight, scan, diversion_draw, destination_outcomes, timestamp, id_stems
+            )
+    
+    def _monitor_single_route(self, flight, scan, diversion_draw, destination_outcomes, timestamp, id_stems):
+        """Yield the route alerts for a single flight from its log scan"""
         flight_id = flight['flight_id']
-        alerts = []
-        
-        # Get route info
-        origin = None
-        destination = None
-        
-        for log in flight['logs']:
-            if 'origin' in log and 'destination' in log:
-                origin = log['origin']
-                destination = log['destination']
-                break
+        origin, destination, tripped = scan
         
         if not origin or not destination:
-            return alerts
+            return
         
-        # Check weather enroute
-        weather_alerts = self._check_route_weather(flight, origin, destination)
-        alerts.extend(weather_alerts)
+        alerted = False  # Whether any weather alert was yielded, which makes diversion worth checking
+        
+        # Check weather enroute; flights without tripped weather logs skip straight past
+        for mask, metrics in tripped:
+            for alert in self._check_route_weather(mask, metrics, flight_id, timestamp, id_stems):
+                alerted = True
+                yield alert
         
         # Check destination weather
-        dest_alerts = self._check_destination_weather(flight, destination)
-        alerts.extend(dest_alerts)
+        for alert in self._check_destination_weather(flight, destination, destination_outcomes, timestamp, id_stems):
+            alerted = True
+            yield alert
         
         # Check for diversion needs
-        if weather_alerts or dest_alerts:
-            diversion = self._suggest_diversion(origin, destination, flight_id)
+        if alerted:
+            diversion = self._suggest_diversion(origin, destination, flight_id, diversion_draw, timestamp, id_stems)
             if diversion:
-                alerts.append(diversion)
-        
-        return alerts
+                yield diversion
+    
+    def _new_alert(self, prefix, flight_id, timestamp, id_stems, row=None):
+        """Build an alert positionally from a prebuilt field row (the type's static row by default)"""
+        # The batch time tag alone repeats within a second, so IDs carry a sequence number
+        return RouteAlert(
+            id_stems[prefix] + str(next(self.alert_sequence)),
+            flight_id,
+            timestamp,
+            *(ALERT_ROWS[prefix] if row is None else row)
+        )
     
-    def _check_route_weather(self, flight, origin, destination):
-        """Check weather along the route"""
-        alerts = []
+    def _check_route_weather(self, mask, metrics, flight_id, timestamp, id_stems):
+        """Yield the enroute alerts for one weather log's condition mask"""
+        # Severe turbulence
+        if mask & TURBULENCE_BIT:
+            yield self._new_alert('WX-TURB', flight_id, timestamp, id_stems)
+        
+        # Thunderstorms
+        if mask & THUNDERSTORM_BIT:
+            yield self._new_alert('WX-TSTM', flight_id, timestamp, id_stems)
+        
+        # High crosswind
+        if mask & CROSSWIND_BIT:
+            yield self._new_alert('WX-WIND', flight_id, timestamp, id_stems, _alert_row(
+                'WX-WIND',
+                value=metrics['crosswind'],
+                message=f'High crosswind ({metrics["crosswind"]:.1f} knots) along route'
+            ))
+    
+    def _check_destination_weather(self, flight, destination, destination_outcomes, timestamp, id_stems):
+        """Yield alerts for destination weather conditions"""
         flight_id = flight['flight_id']
         
-        # Get weather logs for this flight
-        weather_logs = [log for log in flight['logs'] if log['log_type'] == 'weather_data']
-        
-        for log in weather_logs:
-            metrics = log['metrics']
-            
-            # Severe turbulence
-            if metrics.get('turbulence') == 'severe':
-                alert = {
-                    'alert_id': f"WX-TURB-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'SEVERE_TURBULENCE_ENROUTE',
-                    'severity': 'HIGH',
-                    'location': 'Enroute',
-                    'metric': 'turbulence',
-                    'value': 'severe',
-                    'message': 'Severe turbulence detected along route',
-                    'recommendation': 'Consider altitude change or route deviation'
-                }
-                alerts.append(alert)
-            
-            # Thunderstorms
-            if metrics.get('thunderstorm', False):
-                alert = {
-                    'alert_id': f"WX-TSTM-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'THUNDERSTORM_ENROUTE',
-                    'severity': 'HIGH',
-                    'location': 'Enroute',
-                    'metric': 'thunderstorm',
-                    'value': True,
-                    'message': 'Thunderstorm activity along route',
-                    'recommendation': 'Request weather deviation clearance'
-                }
-                alerts.append(alert)
-            
-            # High crosswind
-            if metrics.get('crosswind', 0) > 40:
-                alert = {
-                    'alert_id': f"WX-WIND-{datetime.now().strftime('%H%M%S')}",
-                    'flight_id': flight_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'alert_type': 'HIGH_CROSSWIND_ENROUTE',
-                    'severity': 'MEDIUM',
-                    'location': 'Enroute',
-                    'metric': 'crosswind',
-                    'value': metrics['crosswind'],
-                    'threshold': 40,
-                    'message': f'High crosswind ({metrics["crosswind"]:.1f} knots) along route',
-                    'recommendation': 'Be prepared for challenging conditions'
-                }
-                alerts.append(alert)
+        # Flights bound for the same airport share one evaluated outcome; only IDs differ per flight
+        outcomes = destination_outcomes.get(destination)
+        if outcomes is None:
+            outcomes = destination_outcomes[destination] = self._destination_outcomes(destination)
         
-        return alerts
+        for prefix, row in outcomes:
+            yield self._new_alert(prefix, flight_id, timestamp, id_stems, row)
     
-    def _check_destination_weather(self, flight, destination):
-        """Check destination weather conditions"""
-        alerts = []
-        flight_id = flight['flight_id']
+    def _destination_outcomes(self, destination):
+        """Evaluate destination weather once into (alert prefix, field row) pairs"""
+        # Only airports in the network have a weather feed; skip the simulation for the rest
+        if destination not in self.airports:
+            return ()
+        
+        outcomes = []
         
         # Simulate destination weather (in real system, this would be from API)
         dest_weather = self._simulate_destination_weather(destination)
         
         # Low visibility
-        if dest_weather['visibility'] < 1500:
-            alert = {
-                'alert_id': f"WX-VIS-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'LOW_VISIBILITY_AT_DESTINATION',
-                'severity': 'HIGH',
-                'location': destination,
-                'metric': 'visibility',
-                'value': dest_weather['visibility'],
-                'threshold': 1500,
-                'message': f'Low visibility at {destination}: {dest_weather["visibility"]:.0f} meters',
-                'recommendation': 'Consider holding or diversion'
-            }
-            alerts.append(alert)
+        if dest_weather['visibility'] < DEST_VISIBILITY_MIN_METERS:
+            outcomes.append(('WX-VIS', _alert_row(
+                'WX-VIS',
+                location=destination,
+                value=dest_weather['visibility'],
+                message=f'Low visibility at {destination}: {dest_weather["visibility"]:.0f} meters'
+            )))
         
         # Thunderstorm at destination
         if dest_weather['thunderstorm']:
-            alert = {
-                'alert_id': f"WX-DEST-TSTM-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'THUNDERSTORM_AT_DESTINATION',
-                'severity': 'HIGH',
-                'location': destination,
-                'metric': 'thunderstorm',
-                'value': True,
-                'message': f'Thunderstorm activity at {destination}',
-                'recommendation': 'Hold or divert to alternate'
-            }
-            alerts.append(alert)
+            outcomes.append(('WX-DEST-TSTM', _alert_row(
+                'WX-DEST-TSTM',
+                location=destination,
+                message=f'Thunderstorm activity at {destination}'
+            )))
         
         # High winds at destination
-        if dest_weather['wind_speed'] > 30:
-            alert = {
-                'alert_id': f"WX-DEST-WIND-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'HIGH_WINDS_AT_DESTINATION',
-                'severity': 'MEDIUM',
-                'location': destination,
-                'metric': 'wind_speed',
-                'value': dest_weather['wind_speed'],
-                'threshold': 30,
-                'message': f'High winds at {destination}: {dest_weather["wind_speed"]:.1f} knots',
-                'recommendation': 'Be prepared for challenging landing'
-            }
-            alerts.append(alert)
-        
-        return alerts
+        if dest_weather['wind_speed'] > DEST_WIND_MAX_KNOTS:
+            outcomes.append(('WX-DEST-WIND', _alert_row(
+                'WX-DEST-WIND',
+                location=destination,
+                value=dest_weather['wind_speed'],
+                message=f'High winds at {destination}: {dest_weather["wind_speed"]:.1f} knots'
+            )))
+        
+        return outcomes
     
-    def _suggest_diversion(self, origin, destination, flight_id):
+    def _suggest_diversion(self, origin, destination, flight_id, diversion_draw, timestamp, id_stems):
         """Suggest diversion airport if needed"""
-        if destination not in self.airports:
+        # Covers both unknown airports and airports without alternates
+        if destination not in DIVERTIBLE_DESTINATIONS:
             return None
         
-        # Check if diversion is needed (simulated logic)
-        need_diversion = random.random() < 0.2  # 20% chance for demo
+        # Check if diversion is needed (simulated logic); additional time is simplified, in minutes
+        roll, additional_time = diversion_draw
+        need_diversion = roll < 20  # 20% chance for demo
         
-        if need_diversion and self.airports[destination]['alt_runways']:
-            alt_airport = random.choice(self.airports[destination]['alt_runways'])
-            
-            # Calculate additional time (simplified)
-            additional_time = random.randint(30, 120)  # minutes
+        if need_diversion:
+            # Reuses the roll instead of another draw; see the alternate-count check at ALT_RUNWAYS
+            alternates = self.alt_runways[destination]
+            alt_airport = alternates[roll % len(alternates)]
             
-            return {
-                'alert_id': f"DIV-{datetime.now().strftime('%H%M%S')}",
-                'flight_id': flight_id,
-                'timestamp': datetime.now().isoformat(),
-                'alert_type': 'DIVERSION_RECOMMENDED',
-                'severity': 'HIGH',
-                'current_destination': destination,
-                'suggested_diversion': alt_airport,
-                'additional_flight_time_minutes': additional_time,
-                'message': f'Consider diverting to {alt_airport} due to weather at {destination}',
-                'recommendation': f'Divert to {alt_airport}, estimated additional time: {additional_time} minutes'
-            }
+            return self._new_alert('DIV', flight_id, timestamp, id_stems, _alert_row(
+                'DIV',
+                current_destination=destination,
+                suggested_diversion=alt_airport,
+                additional_flight_time_minutes=additional_time,
+                message=f'Consider diverting to {alt_airport} due to weather at {destination}',
+                recommendation=f'Divert to {alt_airport}, estimated additional time: {additional_time} minutes'
+            ))
         
         return None
     
     def _simulate_destination_weather(self, airport_code):
         """Simulate destination weather conditions"""
         # In real system, this would fetch from weather API
+        uniform = self._rng.uniform
         return {
-            'visibility': random.uniform(800, 5000),
-            'wind_speed': random.uniform(10, 50),
-            'thunderstorm': random.random() < 0.3,  # 30% chance
-            'ceiling': random.uniform(1000, 10000),
-            'temperature': random.uniform(15, 35)
-        }
-    def _simulate_destination_weather(self, airport_code):
-        """Simulate destination weather conditions"""
-        # In real system, this would fetch from weather API
-        return {
-            'visibility': random.uniform(800, 5000),
-            'wind_speed': random.uniform(10, 50),
-            'thunderstorm': random.random() < 0.3,  # 30% chance
-            'ceiling': random.uniform(1000, 10000),
-            'temperature': random.uniform(15, 35)
+            'visibility': uniform(800, 5000),
+            'wind_speed': uniform(10, 50),
+            'thunderstorm': self._rng.random() < 0.3,  # 30% chance
+            'ceiling': uniform(1000, 10000),
+            'temperature': uniform(15, 35)
         }
\ No newline at end of file
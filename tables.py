@@ -0,0 +1,22 @@
+"""
+Module for rendering plain-text grid tables
+"""
+
+
+def grid_table(rows, headers, aligns=None):
+    """Render rows as a grid table; aligns holds '<' or '>' per column (default left)"""
+    aligns = aligns or '<' * len(headers)
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [len(h) + 2 for h in headers]  # Headers keep two spaces of slack
+    for row in rows:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    
+    row_fmt = '| ' + ' | '.join(f'{{:{a}{w}}}' for a, w in zip(aligns, widths)) + ' |'
+    border = '+' + '+'.join('-' * (w + 2) for w in widths) + '+'
+    lines = [border, row_fmt.format(*headers), border.replace('-', '=')]
+    for row in rows:
+        lines.append(row_fmt.format(*row))
+        lines.append(border)
+    return '\n'.join(lines)
\ No newline at end of file